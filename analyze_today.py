@@ -3,46 +3,66 @@
 Analyze and filter today's collected articles for AI agent digest.
 """
 
+import argparse
 import json
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+SRC_DIR = Path(__file__).resolve().parent / 'src'
+if str(SRC_DIR) not in sys.path:
+    sys.path.append(str(SRC_DIR))
+
+from article_archive import load_json_articles
+from normalize import search_text
+
+# Keyword rules, built once per process so a warm worker reuses them
+AGENTIC_KEYWORDS = (
+    'agent', 'agentic', 'autonomous', 'multi-agent', 'tool use',
+    'function calling', 'mcp', 'model context protocol',
+    'reasoning', 'planning', 'workflow', 'orchestration',
+    'tool calling', 'langchain', 'langgraph', 'crewai'
+)
+PRODUCTION_KEYWORDS = (
+    'production', 'deployment', 'real-world', 'implementation',
+    'case study', 'benchmark', 'framework', 'sdk', 'api',
+    'system', 'platform', 'enterprise', 'scale'
+)
+AI_KEYWORDS = ('llm', 'large language', 'ai', 'gpt', 'claude', 'gemini')
+DEVELOPER_KEYWORDS = ('developer', 'code', 'programming', 'engineering')
+THEORY_KEYWORDS = ('theoretical', 'mathematical proof', 'convergence')
+
+# Category rules in priority order; the first match wins
+CATEGORY_RULES = (
+    ('Production Use Cases', ('production', 'deployment', 'real-world', 'case study')),
+    ('Frameworks & Tools', ('framework', 'sdk', 'tool', 'library', 'api')),
+    ('Developer Resources', ('tutorial', 'guide', 'how to', 'example')),
+    ('Trends & Analysis', ('trend', 'analysis', 'survey', 'benchmark')),
+)
 
 
 def score_article(article: Dict[str, Any]) -> int:
     """Score article relevance (0-100) for AI agents and agentic systems."""
-    title = article.get('title', '').lower()
-    description = str(article.get('description', '')).lower()
     url = article.get('url', '').lower()
-    combined = f"{title} {description}"
+    combined = search_text(article)
 
     score = 0
 
     # High-value agentic keywords - 40 points
-    agentic_keywords = [
-        'agent', 'agentic', 'autonomous', 'multi-agent', 'tool use',
-        'function calling', 'mcp', 'model context protocol',
-        'reasoning', 'planning', 'workflow', 'orchestration',
-        'tool calling', 'langchain', 'langgraph', 'crewai'
-    ]
-    matches = sum(1 for kw in agentic_keywords if kw in combined)
+    matches = sum(1 for kw in AGENTIC_KEYWORDS if kw in combined)
     score += min(40, matches * 15)
 
     # Production/practical - 30 points
-    production_keywords = [
-        'production', 'deployment', 'real-world', 'implementation',
-        'case study', 'benchmark', 'framework', 'sdk', 'api',
-        'system', 'platform', 'enterprise', 'scale'
-    ]
-    if any(kw in combined for kw in production_keywords):
+    if any(kw in combined for kw in PRODUCTION_KEYWORDS):
         score += 25
 
     # AI/LLM relevance - 20 points
-    if any(kw in combined for kw in ['llm', 'large language', 'ai', 'gpt', 'claude', 'gemini']):
+    if any(kw in combined for kw in AI_KEYWORDS):
         score += 20
 
     # Developer focus - 10 points
-    if any(kw in combined for kw in ['developer', 'code', 'programming', 'engineering']):
+    if any(kw in combined for kw in DEVELOPER_KEYWORDS):
         score += 10
 
     # Prefer industry sources
@@ -51,7 +71,7 @@ def score_article(article: Dict[str, Any]) -> int:
 
     # Penalty for pure theory
     if 'arxiv.org' in url:
-        if any(kw in combined for kw in ['theoretical', 'mathematical proof', 'convergence']):
+        if any(kw in combined for kw in THEORY_KEYWORDS):
             score -= 15
 
     return max(0, min(100, score))
@@ -59,28 +79,34 @@ def score_article(article: Dict[str, Any]) -> int:
 
 def categorize_article(article: Dict[str, Any]) -> str:
     """Categorize article by focus area."""
-    title = article.get('title', '').lower()
-    description = str(article.get('description', '')).lower()
-    combined = f"{title} {description}"
-
-    if any(kw in combined for kw in ['production', 'deployment', 'real-world', 'case study']):
-        return 'Production Use Cases'
-    if any(kw in combined for kw in ['framework', 'sdk', 'tool', 'library', 'api']):
-        return 'Frameworks & Tools'
-    if any(kw in combined for kw in ['tutorial', 'guide', 'how to', 'example']):
-        return 'Developer Resources'
-    if any(kw in combined for kw in ['trend', 'analysis', 'survey', 'benchmark']):
-        return 'Trends & Analysis'
-    return 'Research & Breakthroughs'
+    combined = search_text(article)
 
+    for category, keywords in CATEGORY_RULES:
+        if any(kw in combined for kw in keywords):
+            return category
+    return 'Research & Breakthroughs'
 
-def main():
-    # Load today's collected articles
-    input_path = Path('ai-digest/data/collected_articles.json')
-    with open(input_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
 
-    articles = data.get('articles', [])
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Analyze and filter today's collected articles for AI agent digest"
+    )
+    parser.add_argument(
+        '--input',
+        type=Path,
+        default=Path('ai-digest/data/collected_articles.json'),
+        help='Path to collected articles JSON'
+    )
+    parser.add_argument(
+        '--output',
+        type=Path,
+        default=Path('ai-digest/data/filtered_articles.json'),
+        help='Output path for filtered articles JSON'
+    )
+    args = parser.parse_args(argv)
+
+    # Load today's collected articles (reused by a warm worker while unchanged)
+    articles = load_json_articles(args.input)
     print(f"Analyzing {len(articles)} collected articles...")
 
     # Score and filter
@@ -138,7 +164,7 @@ def main():
         'articles': selected
     }
 
-    output_path = Path('ai-digest/data/filtered_articles.json')
+    output_path = args.output
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(output, f, indent=2, ensure_ascii=False)
 
@@ -4,11 +4,56 @@ Filter collected articles and generate daily digest.
 Focuses on AI agents, agentic AI, and autonomous systems for developers.
 """
 
+import argparse
 import json
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+SRC_DIR = Path(__file__).resolve().parent / 'src'
+if str(SRC_DIR) not in sys.path:
+    sys.path.append(str(SRC_DIR))
+
+from article_archive import load_json_articles
+from normalize import search_text
+
+# Keyword rules, built once per process so a warm worker reuses them
+HIGH_VALUE_KEYWORDS = (
+    'agent', 'agentic', 'autonomous', 'multi-agent', 'tool use',
+    'function calling', 'mcp', 'model context protocol',
+    'reasoning', 'planning', 'workflow', 'orchestration'
+)
+PRODUCTION_KEYWORDS = (
+    'production', 'deployment', 'real-world', 'implementation',
+    'case study', 'benchmark', 'framework', 'sdk', 'api',
+    'tool', 'application', 'system', 'platform'
+)
+AI_KEYWORDS = (
+    'llm', 'large language model', 'gpt', 'claude', 'gemini',
+    'ai', 'artificial intelligence', 'neural', 'transformer'
+)
+DEV_KEYWORDS = (
+    'developer', 'coding', 'programming', 'software',
+    'engineering', 'code', 'github'
+)
+THEORY_ONLY_KEYWORDS = (
+    'theoretical', 'mathematical proof', 'convergence analysis',
+    'formal verification', 'complexity bounds'
+)
+BREAKTHROUGH_KEYWORDS = (
+    'breakthrough', 'novel', 'first', 'new benchmark',
+    'state-of-the-art', 'sota', 'outperforms'
+)
+
+# Category rules in priority order (matters!); the first match wins
+CATEGORY_RULES = (
+    ('Production Use Cases', ('production', 'deployment', 'real-world', 'case study', 'implementation')),
+    ('Frameworks & Tools', ('framework', 'sdk', 'tool', 'library', 'api', 'platform')),
+    ('Developer Resources', ('tutorial', 'guide', 'how to', 'documentation', 'example')),
+    ('Trends & Analysis', ('trend', 'analysis', 'survey', 'benchmark', 'evaluation')),
+)
 
 
 def score_article(article: Dict[str, Any]) -> int:
@@ -16,54 +61,26 @@ def score_article(article: Dict[str, Any]) -> int:
     Score article relevance (0-100) based on AI agent/agentic system focus.
     Prioritizes production use cases over academic research.
     """
-    title = article.get('title', '').lower()
-    description = article.get('description', '').lower()
     url = article.get('url', '').lower()
-    combined = f"{title} {description}"
+    combined = search_text(article)
 
     score = 0
 
     # High-value keywords (agentic AI focus) - 40 points
-    high_value = [
-        'agent', 'agentic', 'autonomous', 'multi-agent', 'tool use',
-        'function calling', 'mcp', 'model context protocol',
-        'reasoning', 'planning', 'workflow', 'orchestration'
-    ]
-    for keyword in high_value:
-        if keyword in combined:
-            score += 20
-            break
+    if any(keyword in combined for keyword in HIGH_VALUE_KEYWORDS):
+        score += 20
 
     # Production/practical keywords - 30 points
-    production_keywords = [
-        'production', 'deployment', 'real-world', 'implementation',
-        'case study', 'benchmark', 'framework', 'sdk', 'api',
-        'tool', 'application', 'system', 'platform'
-    ]
-    for keyword in production_keywords:
-        if keyword in combined:
-            score += 15
-            break
+    if any(keyword in combined for keyword in PRODUCTION_KEYWORDS):
+        score += 15
 
     # AI/LLM relevance - 20 points
-    ai_keywords = [
-        'llm', 'large language model', 'gpt', 'claude', 'gemini',
-        'ai', 'artificial intelligence', 'neural', 'transformer'
-    ]
-    for keyword in ai_keywords:
-        if keyword in combined:
-            score += 20
-            break
+    if any(keyword in combined for keyword in AI_KEYWORDS):
+        score += 20
 
     # Developer-focused - 10 points
-    dev_keywords = [
-        'developer', 'coding', 'programming', 'software',
-        'engineering', 'code', 'github'
-    ]
-    for keyword in dev_keywords:
-        if keyword in combined:
-            score += 10
-            break
+    if any(keyword in combined for keyword in DEV_KEYWORDS):
+        score += 10
 
     # Bonus for non-arXiv sources (prefer industry news)
     if 'arxiv.org' not in url:
@@ -71,20 +88,12 @@ def score_article(article: Dict[str, Any]) -> int:
 
     # Penalty for pure theory/academic without practical focus
     if 'arxiv.org' in url:
-        theory_only = [
-            'theoretical', 'mathematical proof', 'convergence analysis',
-            'formal verification', 'complexity bounds'
-        ]
-        if any(keyword in combined for keyword in theory_only):
+        if any(keyword in combined for keyword in THEORY_ONLY_KEYWORDS):
             score -= 20
 
     # Bonus for breakthrough/novel research (if from arXiv)
     if 'arxiv.org' in url:
-        breakthrough_keywords = [
-            'breakthrough', 'novel', 'first', 'new benchmark',
-            'state-of-the-art', 'sota', 'outperforms'
-        ]
-        if any(keyword in combined for keyword in breakthrough_keywords):
+        if any(keyword in combined for keyword in BREAKTHROUGH_KEYWORDS):
             score += 15
 
     return max(0, min(100, score))
@@ -92,23 +101,12 @@ def score_article(article: Dict[str, Any]) -> int:
 
 def categorize_article(article: Dict[str, Any]) -> str:
     """Categorize article by primary focus."""
-    title = article.get('title', '').lower()
-    description = article.get('description', '').lower()
     url = article.get('url', '').lower()
-    combined = f"{title} {description}"
-
-    # Priority order matters!
-    if any(k in combined for k in ['production', 'deployment', 'real-world', 'case study', 'implementation']):
-        return 'Production Use Cases'
-
-    if any(k in combined for k in ['framework', 'sdk', 'tool', 'library', 'api', 'platform']):
-        return 'Frameworks & Tools'
+    combined = search_text(article)
 
-    if any(k in combined for k in ['tutorial', 'guide', 'how to', 'documentation', 'example']):
-        return 'Developer Resources'
-
-    if any(k in combined for k in ['trend', 'analysis', 'survey', 'benchmark', 'evaluation']):
-        return 'Trends & Analysis'
+    for category, keywords in CATEGORY_RULES:
+        if any(k in combined for k in keywords):
+            return category
 
     # Default to research (lowest priority)
     return 'Research & Breakthroughs'
@@ -125,12 +123,26 @@ def generate_summary(article: Dict[str, Any]) -> Dict[str, str]:
     }
 
 
-def main():
-    # Load collected articles
-    with open('ai-digest/data/collected_articles.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    articles = data.get('articles', [])
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description='Filter collected articles and prepare daily digest'
+    )
+    parser.add_argument(
+        '--input',
+        type=Path,
+        default=Path('ai-digest/data/collected_articles.json'),
+        help='Path to collected articles JSON'
+    )
+    parser.add_argument(
+        '--output',
+        type=Path,
+        default=Path('ai-digest/data/filtered_articles.json'),
+        help='Output path for filtered articles JSON'
+    )
+    args = parser.parse_args(argv)
+
+    # Load collected articles (reused by a warm worker while unchanged)
+    articles = load_json_articles(args.input)
     print(f"Total collected articles: {len(articles)}")
 
     # Score and filter articles
@@ -180,10 +192,10 @@ def main():
         'articles': selected_articles
     }
 
-    with open('ai-digest/data/filtered_articles.json', 'w', encoding='utf-8') as f:
+    with open(args.output, 'w', encoding='utf-8') as f:
         json.dump(output, f, indent=2, ensure_ascii=False)
 
-    print(f"\nFiltered articles saved to: ai-digest/data/filtered_articles.json")
+    print(f"\nFiltered articles saved to: {args.output}")
     print("\nTop 10 articles by score:")
     for i, article in enumerate(selected_articles[:10], 1):
         print(f"{i}. [{article['relevance_score']}] {article['title'][:80]}...")
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Unified command line for AI Agent Daily Digest.
+Dispatches subcommands to the pipeline scripts, importing each one only when
+it is used. `serve` starts an optional warm worker that keeps modules and
+parsed articles in memory and answers later invocations over a local socket.
+
+Usage:
+    ai_digest.py collect --hours 24
+    ai_digest.py analyze-today
+    ai_digest.py serve &          # later commands are forwarded to the worker
+"""
+
+import argparse
+import importlib
+import io
+import json
+import os
+import socket
+import sys
+import traceback
+from contextlib import redirect_stdout, redirect_stderr
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+SRC_DIR = Path(__file__).resolve().parent
+REPO_DIR = SRC_DIR.parent
+
+# Subcommand -> (module, description). Modules are imported on first use.
+COMMANDS = {
+    'collect': ('collect_articles', 'Collect articles from RSS feeds'),
+    'analyze': ('analyze_articles', 'Score and categorize recent articles'),
+    'analyze-today': ('analyze_today', "Analyze and filter today's collected articles"),
+    'filter': ('filter_and_generate', 'Filter collected articles and prepare the digest'),
+    'archive': ('article_archive', 'Import, export and inspect the article archive'),
+    'snapshot': ('columnar_snapshot', 'Build and query the columnar snapshot'),
+    'trends': ('trends', 'Update and report emerging terms'),
+    'relevance': ('relevance_model', 'Train, benchmark and run the learned relevance scorer'),
+    'normalize': ('normalize', 'Add clean description text to collected articles'),
+}
+
+DEFAULT_SOCKET = Path('ai-digest/data/worker.sock')
+MAX_REQUEST_BYTES = 1 << 20
+
+
+def _import_command(command: str):
+    module_name = COMMANDS[command][0]
+    # Root-level scripts live next to src/, not inside it
+    for path in (SRC_DIR, REPO_DIR):
+        if str(path) not in sys.path:
+            sys.path.append(str(path))
+    return importlib.import_module(module_name)
+
+
+def run_command(command: str, args: List[str]) -> int:
+    """Run a subcommand in this process and return its exit status."""
+    try:
+        _import_command(command).main(args)
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    return 0
+
+
+def _socket_path(value: Optional[Path]) -> Path:
+    if value is not None:
+        return value
+    return Path(os.environ.get('AI_DIGEST_SOCKET', DEFAULT_SOCKET))
+
+
+def _send(socket_path: Path, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Send a request to the worker. Returns None if no worker is listening."""
+    if not hasattr(socket, 'AF_UNIX') or not socket_path.exists():
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            return None
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        sock.shutdown(socket.SHUT_WR)
+        with sock.makefile('rb') as f:
+            return json.loads(f.read().decode('utf-8'))
+
+
+def _error_response(message: str) -> Dict[str, Any]:
+    return {'status': 2, 'stdout': '', 'stderr': f"Error: {message}\n"}
+
+
+def _validate_request(request: Any) -> Optional[str]:
+    """Return a description of what is wrong with a request, or None if it is usable."""
+    if not isinstance(request, dict):
+        return "request must be a JSON object"
+    if request.get('ping') or request.get('stop'):
+        return None
+    if request.get('command') not in COMMANDS:
+        return f"unknown command: {request.get('command')!r}"
+    args = request.get('args')
+    if not isinstance(args, list) or not all(isinstance(a, str) for a in args):
+        return "'args' must be a list of strings"
+    if not isinstance(request.get('cwd'), str):
+        return "'cwd' must be a string"
+    return None
+
+
+def _handle_request(request: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    """Run one forwarded command. Returns (response, keep_serving)."""
+    if request.get('stop'):
+        return {'status': 0, 'stdout': 'Worker stopped\n', 'stderr': ''}, False
+
+    command, args = request['command'], request['args']
+    stdout, stderr = io.StringIO(), io.StringIO()
+    previous_cwd = os.getcwd()
+    try:
+        # Relative paths resolve against the client's working directory
+        try:
+            os.chdir(request['cwd'])
+        except OSError as e:
+            return _error_response(f"cannot change to {request['cwd']}: {e}"), True
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                status = run_command(command, args)
+            except Exception:
+                traceback.print_exc()
+                status = 1
+    finally:
+        os.chdir(previous_cwd)
+
+    return {'status': status, 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}, True
+
+
+def serve(socket_path: Path) -> None:
+    """Serve forwarded commands one at a time until asked to stop."""
+    if not hasattr(socket, 'AF_UNIX'):
+        print("Error: worker mode requires Unix domain sockets", file=sys.stderr)
+        sys.exit(1)
+    if _send(socket_path, {'ping': True}) is not None:
+        print(f"Error: a worker is already listening on {socket_path}", file=sys.stderr)
+        sys.exit(1)
+
+    # Warm up: import every pipeline module and keep parsed articles cached
+    for command in COMMANDS:
+        try:
+            _import_command(command)
+        except ImportError as e:
+            print(f"Warning: '{command}' unavailable in worker: {e}", file=sys.stderr)
+    from article_archive import enable_cache
+    enable_cache()
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        socket_path.unlink()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    os.chmod(socket_path, 0o600)
+    server.listen()
+    print(f"✓ Worker listening on {socket_path} (stop with: ai_digest.py stop)")
+
+    try:
+        keep_serving = True
+        while keep_serving:
+            conn, _ = server.accept()
+            # A bad request or a client that hangs up must not take the worker down
+            try:
+                with conn, conn.makefile('rb') as f:
+                    try:
+                        request = json.loads(f.read(MAX_REQUEST_BYTES).decode('utf-8'))
+                    except ValueError:
+                        request = None
+                    problem = _validate_request(request)
+                    if problem is not None:
+                        response = _error_response(f"invalid worker request: {problem}")
+                    elif request.get('ping'):
+                        response = {'status': 0, 'stdout': '', 'stderr': ''}
+                    else:
+                        response, keep_serving = _handle_request(request)
+                    conn.sendall(json.dumps(response, ensure_ascii=False).encode('utf-8'))
+            except OSError as e:
+                print(f"Warning: dropped worker connection: {e}", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        if socket_path.exists():
+            socket_path.unlink()
+
+
+def main(argv: Optional[List[str]] = None):
+    commands = [(name, desc) for name, (_, desc) in COMMANDS.items()]
+    commands += [('serve', 'Start a warm worker'), ('stop', 'Stop the warm worker')]
+    parser = argparse.ArgumentParser(
+        description='AI agent daily digest pipeline',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='commands:\n' + '\n'.join(f"  {name:<15}{desc}" for name, desc in commands)
+               + '\n\nRun "<command> --help" for command options.'
+    )
+    parser.add_argument(
+        '--socket',
+        type=Path,
+        help=f'Worker socket path (default: $AI_DIGEST_SOCKET or {DEFAULT_SOCKET})'
+    )
+    parser.add_argument(
+        '--no-worker',
+        action='store_true',
+        help='Run in this process even if a warm worker is listening'
+    )
+    parser.add_argument(
+        'command',
+        choices=[name for name, _ in commands],
+        metavar='command',
+        help='Command to run (see below)'
+    )
+    parser.add_argument('args', nargs=argparse.REMAINDER, help='Arguments for the command')
+
+    args = parser.parse_args(argv)
+    socket_path = _socket_path(args.socket)
+
+    if args.command == 'serve':
+        serve(socket_path)
+        return
+    if args.command == 'stop':
+        response = _send(socket_path, {'stop': True})
+        print(response['stdout'].strip() if response else "No worker running")
+        return
+
+    if not args.no_worker:
+        request = {'command': args.command, 'args': args.args, 'cwd': os.getcwd()}
+        response = _send(socket_path, request)
+        if response is not None:
+            sys.stdout.write(response['stdout'])
+            sys.stderr.write(response['stderr'])
+            sys.exit(response['status'])
+
+    sys.exit(run_command(args.command, args.args))
+
+
+if __name__ == '__main__':
+    # Ensure UTF-8 encoding for stdout on Windows (only when run as a script,
+    # so importing this module never replaces the streams)
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    main()
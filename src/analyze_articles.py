@@ -1,19 +1,51 @@
 #!/usr/bin/env python3
 """Analyze and filter collected articles for AI digest."""
 
+import argparse
 import json
-from datetime import datetime, timedelta, timezone
+import sys
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict, Tuple
-
-def load_articles(filepath: str) -> List[Dict]:
-    """Load articles from JSON file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        # Handle both list and dict formats
-        if isinstance(data, dict) and 'articles' in data:
-            return data['articles']
-        return data
+from typing import List, Dict, Optional, Tuple
+
+from article_archive import load_json_articles, read_range
+from normalize import search_text
+
+# Keyword rules, built once per process so a warm worker reuses them
+PRODUCTION_KEYWORDS = (
+    'production', 'deployment', 'case study', 'real-world', 'enterprise',
+    'customer', 'implementation', 'using', 'how to', 'practical',
+    'langsmith', 'langgraph', 'servicenow', 'company'
+)
+AGENT_KEYWORDS = (
+    'agent', 'agentic', 'autonomous', 'tool use', 'tool calling',
+    'mcp', 'model context protocol', 'multi-agent', 'orchestration',
+    'reasoning', 'planning', 'workflow'
+)
+FRAMEWORK_KEYWORDS = (
+    'framework', 'library', 'sdk', 'api', 'tool', 'platform',
+    'langchain', 'autogen', 'crewai', 'anthropic', 'openai'
+)
+
+PRODUCTION_INDICATORS = ('production', 'deployment', 'case study', 'customer', 'enterprise', 'real-world', 'implementation')
+FRAMEWORK_INDICATORS = ('framework', 'library', 'sdk', 'api', 'tool', 'release', 'version')
+RESOURCE_INDICATORS = ('guide', 'tutorial', 'how to', 'documentation', 'learning')
+ANALYSIS_INDICATORS = ('trend', 'analysis', 'survey', 'benchmark', 'comparison', 'review')
+
+def load_articles(filepath: str, start: Optional[date] = None,
+                  end: Optional[date] = None, include_undated: bool = False) -> List[Dict]:
+    """Load articles from a JSON file or from an article archive directory."""
+    if Path(filepath).is_dir():
+        return read_range(Path(filepath), start, end, include_undated)
+
+    # Handles both list and dict formats
+    return load_json_articles(Path(filepath))
+
+def _content(article: Dict) -> str:
+    """Lowercased title and summary/description, using the precomputed search text when present."""
+    if 'summary' in article:
+        return f"{article.get('title', '')} {article['summary']}".lower()
+    return search_text(article)
 
 def is_recent(published: str, hours: int = 24) -> bool:
     """Check if article was published within the last N hours."""
@@ -36,40 +68,18 @@ def score_article(article: Dict) -> Tuple[int, str]:
     - Industry trends
     - Research papers (limit arXiv, only breakthrough research)
     """
-    title = article.get('title', '').lower()
-    summary = article.get('summary', article.get('description', '')).lower()
     link = article.get('link', article.get('url', ''))
-    content = f"{title} {summary}"
+    content = _content(article)
 
     # Check if it's an arXiv paper
     is_arxiv = 'arxiv.org' in link
 
-    # High priority keywords - production use cases and real implementations
-    production_keywords = [
-        'production', 'deployment', 'case study', 'real-world', 'enterprise',
-        'customer', 'implementation', 'using', 'how to', 'practical',
-        'langsmith', 'langgraph', 'servicenow', 'company'
-    ]
-
-    # Agent-specific keywords
-    agent_keywords = [
-        'agent', 'agentic', 'autonomous', 'tool use', 'tool calling',
-        'mcp', 'model context protocol', 'multi-agent', 'orchestration',
-        'reasoning', 'planning', 'workflow'
-    ]
-
-    # Framework/tool keywords
-    framework_keywords = [
-        'framework', 'library', 'sdk', 'api', 'tool', 'platform',
-        'langchain', 'autogen', 'crewai', 'anthropic', 'openai'
-    ]
-
     # Calculate base score
     score = 0
     reasons = []
 
     # Check for agent relevance (required for any article)
-    agent_matches = sum(1 for kw in agent_keywords if kw in content)
+    agent_matches = sum(1 for kw in AGENT_KEYWORDS if kw in content)
     if agent_matches == 0:
         return (0, "Not relevant to AI agents")
 
@@ -77,13 +87,13 @@ def score_article(article: Dict) -> Tuple[int, str]:
     reasons.append(f"agent keywords ({agent_matches})")
 
     # Boost for production use cases (highest priority)
-    production_matches = sum(1 for kw in production_keywords if kw in content)
+    production_matches = sum(1 for kw in PRODUCTION_KEYWORDS if kw in content)
     if production_matches > 0:
         score += min(production_matches * 20, 50)
         reasons.append(f"production focus ({production_matches})")
 
     # Moderate boost for frameworks/tools
-    framework_matches = sum(1 for kw in framework_keywords if kw in content)
+    framework_matches = sum(1 for kw in FRAMEWORK_KEYWORDS if kw in content)
     if framework_matches > 0:
         score += min(framework_matches * 10, 30)
         reasons.append(f"framework/tool ({framework_matches})")
@@ -100,34 +110,60 @@ def score_article(article: Dict) -> Tuple[int, str]:
 
 def categorize_article(article: Dict, score: int) -> str:
     """Categorize article into one of the digest categories."""
-    title = article.get('title', '').lower()
-    summary = article.get('summary', article.get('description', '')).lower()
     link = article.get('link', article.get('url', ''))
-    content = f"{title} {summary}"
+    content = _content(article)
 
     is_arxiv = 'arxiv.org' in link
 
     # Check category indicators (in priority order)
-    production_indicators = ['production', 'deployment', 'case study', 'customer', 'enterprise', 'real-world', 'implementation']
-    framework_indicators = ['framework', 'library', 'sdk', 'api', 'tool', 'release', 'version']
-    resource_indicators = ['guide', 'tutorial', 'how to', 'documentation', 'learning']
-    analysis_indicators = ['trend', 'analysis', 'survey', 'benchmark', 'comparison', 'review']
-
-    if any(ind in content for ind in production_indicators):
+    if any(ind in content for ind in PRODUCTION_INDICATORS):
         return "Production Use Cases"
-    elif any(ind in content for ind in framework_indicators) and not is_arxiv:
+    elif any(ind in content for ind in FRAMEWORK_INDICATORS) and not is_arxiv:
         return "Frameworks & Tools"
-    elif any(ind in content for ind in resource_indicators):
+    elif any(ind in content for ind in RESOURCE_INDICATORS):
         return "Developer Resources"
-    elif any(ind in content for ind in analysis_indicators):
+    elif any(ind in content for ind in ANALYSIS_INDICATORS):
         return "Trends & Analysis"
     else:
         return "Research & Breakthroughs"
 
-def main():
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description='Score, categorize and filter collected articles for AI agent digest'
+    )
+    parser.add_argument(
+        '--data-dir',
+        type=Path,
+        default=Path('ai-digest/data'),
+        help='Directory holding collected_articles.json or archive/'
+    )
+    parser.add_argument(
+        '--scorer',
+        choices=['keywords', 'model'],
+        default='keywords',
+        help='Score with keyword rules or the trained relevance model (default: keywords)'
+    )
+    args = parser.parse_args(argv)
+
+    if args.scorer == 'model':
+        from relevance_model import DEFAULT_MODEL_PATH, load_default_model
+        # Loaded once per run; the model file is re-checked on every invocation
+        try:
+            model_score = load_default_model().score_article
+        except FileNotFoundError:
+            print(f"Error: no relevance model at {DEFAULT_MODEL_PATH} (run: relevance_model.py train)",
+                  file=sys.stderr)
+            sys.exit(1)
+
     # Load articles
-    data_dir = Path(__file__).parent.parent / 'data'
-    articles = load_articles(data_dir / 'collected_articles.json')
+    data_dir = args.data_dir
+    archive_dir = data_dir / 'archive'
+    if archive_dir.is_dir():
+        # Only the last two days' chunks are decompressed
+        today = datetime.now(timezone.utc).date()
+        articles = load_articles(archive_dir, start=today - timedelta(days=2), end=today)
+    else:
+        articles = load_articles(data_dir / 'collected_articles.json')
 
     print(f"Total articles collected: {len(articles)}")
 
@@ -138,7 +174,10 @@ def main():
     # Score and filter articles
     scored_articles = []
     for article in recent_articles:
-        score, reason = score_article(article)
+        if args.scorer == 'model':
+            score, reason = model_score(article), "relevance model"
+        else:
+            score, reason = score_article(article)
         if score >= 60:
             category = categorize_article(article, score)
             scored_articles.append({
@@ -213,7 +252,7 @@ def main():
             print(f"Source: {link}")
             print(f"Published: {article.get('published', 'No date')}")
             print(f"Reason: {item['reason']}")
-            desc = article.get('summary', article.get('description', ''))
+            desc = article.get('summary', article.get('description_text', article.get('description', '')))
             if desc:
                 summary = desc[:200] + "..." if len(desc) > 200 else desc
                 print(f"Summary: {summary}")
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Append-only article archive for AI Agent Daily Digest.
+Stores collected articles as compressed chunks partitioned by publication day,
+with a small JSON sidecar index so date-range reads only decompress the chunks
+they touch.
+
+Layout:
+    archive/
+    ├── index.json                          # Chunk index (sidecar)
+    └── chunks/
+        └── YYYY/
+            └── MM/
+                └── YYYY-MM-DD.NNNNNN.jsonl.gz  # One JSON article per line
+"""
+
+import argparse
+import copy
+import gzip
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is always available
+    zstandard = None
+
+INDEX_VERSION = 1
+INDEX_NAME = 'index.json'
+UNDATED_PARTITION = 'undated'
+CODEC_EXTENSIONS = {'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst'}
+
+# Parsed chunks and JSON files, kept only when a long-lived process opts in
+_cache: Optional[Dict[str, Any]] = None
+MAX_CACHE_ENTRIES = 1024
+
+
+def enable_cache() -> None:
+    """Keep parsed articles in memory between reads (used by the warm worker)."""
+    global _cache
+    if _cache is None:
+        _cache = {}
+
+
+def _copy_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Callers may annotate articles, so never hand out the cached dicts
+    return [dict(a) for a in articles]
+
+
+def _cached(path: Path, loader, copy=_copy_articles) -> Any:
+    """Return loader(path), reusing the parsed result while the file is unchanged."""
+    if _cache is None:
+        return loader(path)
+
+    stat = path.stat()
+    key = str(path.resolve())
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    entry = _cache.pop(key, None)
+    if entry is None or entry[0] != stamp:
+        entry = (stamp, loader(path))
+        _evict_stale()
+    # Re-inserting keeps the dict in least-recently-used order
+    _cache[key] = entry
+    return copy(entry[1])
+
+
+def _evict_stale() -> None:
+    """Drop entries for files that are gone (e.g. compacted chunks) and bound the cache."""
+    for key in [k for k in _cache if not os.path.exists(k)]:
+        del _cache[key]
+    while len(_cache) >= MAX_CACHE_ENTRIES:
+        del _cache[next(iter(_cache))]
+
+
+def default_codec() -> str:
+    """Prefer zstd when the optional zstandard package is installed."""
+    return 'zstd' if zstandard is not None else 'gzip'
+
+
+def _compress(payload: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstd codec requested but 'zstandard' is not installed")
+        return zstandard.ZstdCompressor(level=10).compress(payload)
+    if codec == 'gzip':
+        return gzip.compress(payload, compresslevel=9, mtime=0)
+    raise ValueError(f"Unknown archive codec: {codec}")
+
+
+def _decompress(payload: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Archive chunk is zstd-compressed but 'zstandard' is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if codec == 'gzip':
+        return gzip.decompress(payload)
+    raise ValueError(f"Unknown archive codec: {codec}")
+
+
+def partition_key(article: Dict[str, Any]) -> str:
+    """Return the day partition (YYYY-MM-DD, UTC) for an article."""
+    published = article.get('published', 'Unknown')
+    if not published or published == 'Unknown':
+        return UNDATED_PARTITION
+    try:
+        dt = datetime.fromisoformat(published.replace('Z', '+00:00'))
+    except ValueError:
+        return UNDATED_PARTITION
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).date().isoformat()
+
+
+def load_index(archive_dir: Path) -> Dict[str, Any]:
+    """Load the sidecar index, returning an empty one for a new archive."""
+    index_path = archive_dir / INDEX_NAME
+    if not index_path.exists():
+        return {'version': INDEX_VERSION, 'next_seq': 1, 'chunks': []}
+
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+
+    if index.get('version') != INDEX_VERSION:
+        raise ValueError(f"Unsupported archive index version: {index.get('version')}")
+    return index
+
+
+def _save_index(archive_dir: Path, index: Dict[str, Any]) -> None:
+    """Atomically replace the sidecar index."""
+    index_path = archive_dir / INDEX_NAME
+    tmp_path = index_path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, index_path)
+
+
+def _write_chunk(
+    archive_dir: Path,
+    index: Dict[str, Any],
+    day: str,
+    articles: List[Dict[str, Any]],
+    codec: str,
+    collected_at: str
+) -> Dict[str, Any]:
+    """Write one compressed chunk and return its index entry (not yet saved)."""
+    seq = index['next_seq']
+    index['next_seq'] = seq + 1
+
+    if day == UNDATED_PARTITION:
+        rel_path = Path('chunks') / UNDATED_PARTITION / f"{seq:06d}{CODEC_EXTENSIONS[codec]}"
+    else:
+        rel_path = Path('chunks') / day[:4] / day[5:7] / f"{day}.{seq:06d}{CODEC_EXTENSIONS[codec]}"
+
+    lines = [json.dumps(a, ensure_ascii=False, separators=(',', ':')) for a in articles]
+    raw = ('\n'.join(lines) + '\n').encode('utf-8')
+    compressed = _compress(raw, codec)
+
+    chunk_path = archive_dir / rel_path
+    chunk_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(chunk_path, 'wb') as f:
+        f.write(compressed)
+
+    return {
+        'file': rel_path.as_posix(),
+        'day': day,
+        'seq': seq,
+        'codec': codec,
+        'count': len(lines),
+        'raw_bytes': len(raw),
+        'stored_bytes': len(compressed),
+        'collected_at': collected_at
+    }
+
+
+def append_articles(
+    archive_dir: Path,
+    articles: Iterable[Dict[str, Any]],
+    collected_at: Optional[str] = None,
+    codec: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Append articles to the archive as new per-day chunks.
+    Existing chunks are never rewritten. Returns the new index entries.
+    """
+    codec = codec or default_codec()
+    collected_at = collected_at or datetime.now(timezone.utc).isoformat()
+    index = load_index(archive_dir)
+
+    # Group by day partition, preserving input order within each day
+    partitions: Dict[str, List[Dict[str, Any]]] = {}
+    for article in articles:
+        partitions.setdefault(partition_key(article), []).append(article)
+
+    new_chunks = [
+        _write_chunk(archive_dir, index, day, partitions[day], codec, collected_at)
+        for day in sorted(partitions)
+    ]
+
+    # Index is written last so a crash never references a missing chunk
+    index['chunks'].extend(new_chunks)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    _save_index(archive_dir, index)
+
+    return new_chunks
+
+
+def _read_chunk(archive_dir: Path, chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def load(path: Path) -> List[Dict[str, Any]]:
+        with open(path, 'rb') as f:
+            raw = _decompress(f.read(), chunk['codec'])
+        return [json.loads(line) for line in raw.decode('utf-8').splitlines() if line]
+
+    return _cached(archive_dir / chunk['file'], load)
+
+
+def compact_archive(
+    archive_dir: Path,
+    days: Optional[Iterable[str]] = None,
+    codec: Optional[str] = None
+) -> int:
+    """
+    Merge each day's chunks into a single de-duplicated chunk.
+    Every run appends a small chunk per day it touches, and many small gzip
+    members compress far worse than one per day. Only `days` are compacted
+    if given. Returns the number of chunks removed.
+    """
+    codec = codec or default_codec()
+    index = load_index(archive_dir)
+    wanted = set(days) if days is not None else None
+
+    by_day: Dict[str, List[Dict[str, Any]]] = {}
+    for chunk in index['chunks']:
+        if wanted is None or chunk['day'] in wanted:
+            by_day.setdefault(chunk['day'], []).append(chunk)
+
+    replaced = []
+    for day, chunks in sorted(by_day.items()):
+        if len(chunks) < 2:
+            continue
+        chunks.sort(key=lambda c: c['seq'])
+        # Later runs win, matching read_range's de-duplication
+        by_url: Dict[str, Dict[str, Any]] = {}
+        for chunk in chunks:
+            for article in _read_chunk(archive_dir, chunk):
+                key = article.get('url') or f"{article.get('source_url', '')}#{article.get('title', '')}"
+                by_url.pop(key, None)
+                by_url[key] = article
+
+        merged = _write_chunk(archive_dir, index, day, list(by_url.values()), codec,
+                              max(c['collected_at'] for c in chunks))
+        old_files = {c['file'] for c in chunks}
+        index['chunks'] = [c for c in index['chunks'] if c['file'] not in old_files]
+        index['chunks'].append(merged)
+        replaced.extend(old_files)
+
+    if not replaced:
+        return 0
+
+    # Old chunks are deleted only once the index no longer references them
+    _save_index(archive_dir, index)
+    for rel_path in replaced:
+        (archive_dir / rel_path).unlink(missing_ok=True)
+    return len(replaced)
+
+
+def select_chunks(
+    index: Dict[str, Any],
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    include_undated: bool = False
+) -> List[Dict[str, Any]]:
+    """Return index entries overlapping [start, end] (inclusive), oldest first."""
+    start_key = start.isoformat() if start else None
+    end_key = end.isoformat() if end else None
+
+    selected = []
+    for chunk in index['chunks']:
+        day = chunk['day']
+        if day == UNDATED_PARTITION:
+            if include_undated:
+                selected.append(chunk)
+            continue
+        # ISO dates compare correctly as strings
+        if start_key and day < start_key:
+            continue
+        if end_key and day > end_key:
+            continue
+        selected.append(chunk)
+
+    selected.sort(key=lambda c: c['seq'])
+    return selected
+
+
+def read_range(
+    archive_dir: Path,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    include_undated: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Read articles published between start and end (inclusive, UTC days).
+    Articles seen in several collection runs are de-duplicated by URL,
+    keeping the most recently archived copy. Sorted most recent first.
+    """
+    index = load_index(archive_dir)
+    by_url: Dict[str, Dict[str, Any]] = {}
+    for chunk in select_chunks(index, start, end, include_undated):
+        for article in _read_chunk(archive_dir, chunk):
+            key = article.get('url') or f"{article.get('source_url', '')}#{article.get('title', '')}"
+            by_url[key] = article
+
+    articles = list(by_url.values())
+    articles.sort(
+        key=lambda x: x['published'] if x.get('published', 'Unknown') != "Unknown" else "",
+        reverse=True
+    )
+    return articles
+
+
+def export_range(
+    archive_dir: Path,
+    output_path: Path,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    include_undated: bool = True
+) -> int:
+    """Export a date range in the collected_articles.json format. Returns article count."""
+    articles = read_range(archive_dir, start, end, include_undated)
+
+    end_dt = datetime.combine((end or datetime.now(timezone.utc).date()) + timedelta(days=1),
+                              datetime.min.time(), tzinfo=timezone.utc)
+    if start:
+        cutoff_dt = datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc)
+    else:
+        known = [partition_key(a) for a in articles if partition_key(a) != UNDATED_PARTITION]
+        first = date.fromisoformat(min(known)) if known else end_dt.date() - timedelta(days=1)
+        cutoff_dt = datetime.combine(first, datetime.min.time(), tzinfo=timezone.utc)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'collected_at': datetime.now(timezone.utc).isoformat(),
+            'cutoff_time': cutoff_dt.isoformat(),
+            'hours': int((end_dt - cutoff_dt).total_seconds() // 3600),
+            'total_articles': len(articles),
+            'articles': articles
+        }, f, indent=2, ensure_ascii=False)
+
+    return len(articles)
+
+
+def load_json_articles(filepath: Path) -> List[Dict[str, Any]]:
+    """Load articles from a loose JSON snapshot (collected or filtered format)."""
+    def load(path: Path) -> List[Dict[str, Any]]:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        articles = data.get('articles', []) if isinstance(data, dict) else data
+        # Filtered snapshots wrap each article with its score and category
+        return [a['article'] if isinstance(a.get('article'), dict) else a for a in articles]
+
+    return _cached(Path(filepath), load)
+
+
+def cached_json(filepath: Path) -> Any:
+    """Load a JSON file such as a config or rule table, reusing it while unchanged."""
+    def load(path: Path) -> Any:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    return _cached(Path(filepath), load, copy=copy.deepcopy)
+
+
+def parse_day(value: str) -> date:
+    """argparse type for YYYY-MM-DD dates."""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid date (expected YYYY-MM-DD): {value}")
+
+
+def print_stats(archive_dir: Path) -> None:
+    """Print a summary of archive size and date coverage."""
+    index = load_index(archive_dir)
+    chunks = index['chunks']
+    days = sorted({c['day'] for c in chunks if c['day'] != UNDATED_PARTITION})
+    raw_bytes = sum(c['raw_bytes'] for c in chunks)
+    stored_bytes = sum(c['stored_bytes'] for c in chunks)
+
+    print(f"Archive: {archive_dir}")
+    print(f"  Chunks: {len(chunks)}")
+    print(f"  Articles (incl. duplicates): {sum(c['count'] for c in chunks)}")
+    if days:
+        print(f"  Days: {len(days)} ({days[0]} to {days[-1]})")
+    print(f"  Raw size: {raw_bytes:,} bytes")
+    print(f"  Stored size: {stored_bytes:,} bytes")
+    if raw_bytes:
+        print(f"  Ratio: {stored_bytes / raw_bytes:.1%}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description='Manage the compressed article archive for AI agent digest'
+    )
+    parser.add_argument(
+        '--archive',
+        type=Path,
+        default=Path('ai-digest/data/archive'),
+        help='Path to the archive directory'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help='Append loose JSON snapshots to the archive')
+    import_parser.add_argument('inputs', type=Path, nargs='+', help='JSON files to import')
+    import_parser.add_argument('--codec', choices=sorted(CODEC_EXTENSIONS), help='Chunk compression codec')
+
+    export_parser = subparsers.add_parser('export', help='Export a date range as collected_articles.json')
+    export_parser.add_argument('--start', type=parse_day, help='First day to include (YYYY-MM-DD)')
+    export_parser.add_argument('--end', type=parse_day, help='Last day to include (YYYY-MM-DD)')
+    export_parser.add_argument('--no-undated', action='store_true', help='Skip articles with unknown dates')
+    export_parser.add_argument(
+        '--output',
+        type=Path,
+        default=Path('ai-digest/data/collected_articles.json'),
+        help='Output path for exported articles JSON'
+    )
+
+    subparsers.add_parser('stats', help='Show archive size and coverage')
+    compact_parser = subparsers.add_parser('compact', help="Merge each day's chunks into one")
+    compact_parser.add_argument('--codec', choices=sorted(CODEC_EXTENSIONS), help='Chunk compression codec')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'import':
+        for input_path in args.inputs:
+            articles = load_json_articles(input_path)
+            chunks = append_articles(args.archive, articles, codec=args.codec)
+            print(f"✓ Imported {len(articles)} articles from {input_path} into {len(chunks)} chunks")
+    elif args.command == 'export':
+        count = export_range(args.archive, args.output, args.start, args.end, not args.no_undated)
+        print(f"✓ Exported {count} articles to {args.output}")
+    elif args.command == 'stats':
+        print_stats(args.archive)
+    elif args.command == 'compact':
+        removed = compact_archive(args.archive, codec=args.codec)
+        print(f"✓ Compacted archive, merged {removed} chunks")
+
+
+if __name__ == '__main__':
+    # Ensure UTF-8 encoding for stdout on Windows (only when run as a script,
+    # so importing this module never replaces the streams)
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    main()
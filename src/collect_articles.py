@@ -7,17 +7,16 @@ Fetches articles from configured RSS feeds within a specified time window.
 import argparse
 import json
 import sys
-import io
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import feedparser
 from dateutil import parser as date_parser
 
-# Ensure UTF-8 encoding for stdout on Windows
-if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+from article_archive import append_articles, cached_json, compact_archive, read_range
+from columnar_snapshot import write_snapshot, append_snapshot
+from trends import update_trends, find_spikes
+from normalize import normalize_articles
 
 
 def load_feed_config(config_path: Path) -> List[str]:
@@ -26,8 +25,7 @@ def load_feed_config(config_path: Path) -> List[str]:
         print(f"Error: Configuration file not found at {config_path}", file=sys.stderr)
         sys.exit(1)
 
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = json.load(f)
+    config = cached_json(config_path)
 
     return config.get('feeds', [])
 
@@ -112,7 +110,11 @@ def fetch_articles(feed_url: str, cutoff_time: datetime) -> List[Dict[str, Any]]
     return articles
 
 
-def collect_articles(hours: int, config_path: Path, output_path: Path) -> None:
+def collect_articles(hours: int, config_path: Path, output_path: Path,
+                     archive_path: Optional[Path] = None,
+                     snapshot_path: Optional[Path] = None,
+                     trends_path: Optional[Path] = None,
+                     templates_path: Optional[Path] = None) -> None:
     """Main collection function."""
     # Calculate cutoff time
     cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
@@ -129,6 +131,12 @@ def collect_articles(hours: int, config_path: Path, output_path: Path) -> None:
         articles = fetch_articles(feed_url, cutoff_time)
         all_articles.extend(articles)
 
+    # Extract clean description text once, keeping the raw markup alongside
+    if templates_path is not None:
+        templates = normalize_articles(all_articles, templates_path,
+                                       templates_path.with_name('normalized_cache.json'))
+        print(f"Normalized descriptions using boilerplate templates for {len(templates)} sources\n")
+
     # Sort by publication date (most recent first)
     all_articles.sort(
         key=lambda x: x['published'] if x['published'] != "Unknown" else "",
@@ -136,10 +144,11 @@ def collect_articles(hours: int, config_path: Path, output_path: Path) -> None:
     )
 
     # Save to JSON
+    collected_at = datetime.now(timezone.utc).isoformat()
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump({
-            'collected_at': datetime.now(timezone.utc).isoformat(),
+            'collected_at': collected_at,
             'cutoff_time': cutoff_time.isoformat(),
             'hours': hours,
             'total_articles': len(all_articles),
@@ -150,6 +159,34 @@ def collect_articles(hours: int, config_path: Path, output_path: Path) -> None:
     print(f"✓ Collected {len(all_articles)} articles")
     print(f"✓ Saved to: {output_path}")
 
+    # Append to the compressed archive so earlier runs are not lost
+    if archive_path is not None:
+        chunks = append_articles(archive_path, all_articles, collected_at=collected_at)
+        # Overlapping runs leave several chunks per day; merge the days just touched
+        compact_archive(archive_path, days=[c['day'] for c in chunks])
+        print(f"✓ Archived {len(chunks)} day chunks to: {archive_path}")
+
+    # Add this run's new articles to the columnar snapshot used for stats
+    if snapshot_path is not None and archive_path is None:
+        print("⚠ Skipping columnar snapshot: it mirrors the archive, which is disabled (--no-archive)")
+    elif snapshot_path is not None:
+        added = append_snapshot(all_articles, snapshot_path)
+        if added is None:
+            # First run: seed the snapshot from the whole archive once
+            history = read_range(archive_path, include_undated=True)
+            write_snapshot(history, snapshot_path)
+            print(f"✓ Built columnar snapshot ({len(history)} articles) in: {snapshot_path}")
+        else:
+            print(f"✓ Appended {added} new articles to columnar snapshot: {snapshot_path}")
+
+    # Fold only this run's new articles into the rolling trend summaries
+    if trends_path is not None:
+        added = update_trends(trends_path, all_articles)
+        print(f"✓ Added {added} new articles to trend summaries in: {trends_path}")
+        spikes = find_spikes(trends_path, top=5)
+        if spikes:
+            print("  Emerging terms: " + ", ".join(s['term'] for s in spikes))
+
     # Print summary statistics
     verified_count = sum(1 for a in all_articles if a.get('date_verified', False))
     unverified_count = len(all_articles) - verified_count
@@ -161,7 +198,7 @@ def collect_articles(hours: int, config_path: Path, output_path: Path) -> None:
     print(f"{'='*60}\n")
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(
         description='Collect articles from RSS feeds for AI agent digest'
     )
@@ -184,10 +221,68 @@ def main():
         help='Output path for collected articles JSON'
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        '--archive',
+        type=Path,
+        default=Path('ai-digest/data/archive'),
+        help='Archive directory to append collected articles to'
+    )
+    parser.add_argument(
+        '--no-archive',
+        action='store_true',
+        help='Do not append collected articles to the archive'
+    )
+
+    parser.add_argument(
+        '--snapshot',
+        type=Path,
+        default=Path('ai-digest/data/articles.snapshot'),
+        help='Columnar snapshot directory used by stats reports (requires the archive)'
+    )
+    parser.add_argument(
+        '--no-snapshot',
+        action='store_true',
+        help='Do not write the columnar snapshot'
+    )
+
+    parser.add_argument(
+        '--trends',
+        type=Path,
+        default=Path('ai-digest/data/trends'),
+        help='Directory holding per-day trend summaries'
+    )
+    parser.add_argument(
+        '--no-trends',
+        action='store_true',
+        help='Do not update trend summaries'
+    )
+
+    parser.add_argument(
+        '--templates',
+        type=Path,
+        default=Path('ai-digest/data/boilerplate_templates.json'),
+        help='Learned per-feed boilerplate templates (normalized text is cached alongside)'
+    )
+    parser.add_argument(
+        '--no-normalize',
+        action='store_true',
+        help='Do not add normalized description text'
+    )
+
+    args = parser.parse_args(argv)
 
-    collect_articles(args.hours, args.config, args.output)
+    archive_path = None if args.no_archive else args.archive
+    snapshot_path = None if args.no_snapshot else args.snapshot
+    trends_path = None if args.no_trends else args.trends
+    templates_path = None if args.no_normalize else args.templates
+    collect_articles(args.hours, args.config, args.output, archive_path, snapshot_path, trends_path,
+                     templates_path)
 
 
 if __name__ == '__main__':
+    # Ensure UTF-8 encoding for stdout on Windows (only when run as a script,
+    # so importing this module never replaces the streams)
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
     main()
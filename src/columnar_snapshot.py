@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Columnar article snapshot for AI Agent Daily Digest.
+Stores articles as fixed-width arrays (timestamps, source ids, scores, flags)
+plus offset-indexed UTF-8 string heaps (titles, URLs, normalized descriptions). Snapshots
+are read through mmap, so scans only touch the columns they use.
+
+A snapshot is a directory of immutable segments. Each collection run appends one
+segment holding only the articles not already present, so the per-run cost does
+not grow with the history; `build` rebuilds a single segment from the archive.
+
+    articles.snapshot/
+    └── 000001.col      # One segment per build or collection run
+
+Segment layout (all integers little-endian):
+    8 bytes   magic b'AIDCOL1\\0'
+    8 bytes   header length (uint64)
+    N bytes   JSON header: row count, source table, column offsets
+    ...       column data, each column aligned to 8 bytes
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import struct
+import sys
+import time
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from analyze_articles import score_article
+
+MAGIC = b'AIDCOL1\0'
+FORMAT_VERSION = 1
+UNKNOWN_TIMESTAMP = -(2 ** 63)
+SECONDS_PER_DAY = 86400
+
+# Fixed-width columns: name -> array typecode
+FIXED_COLUMNS = {
+    'published': 'q',      # epoch seconds, UNKNOWN_TIMESTAMP if undated
+    'source_id': 'I',      # index into the header's source table
+    'score': 'h',          # keyword relevance score (0-100)
+    'date_verified': 'B',  # 1 if the publication date was verified
+    'url_hash': 'Q',       # article identity, used to skip rows already stored
+}
+STRING_COLUMNS = ['title', 'url', 'description']
+
+
+def _timestamp(published: str) -> int:
+    if not published or published == 'Unknown':
+        return UNKNOWN_TIMESTAMP
+    try:
+        dt = datetime.fromisoformat(published.replace('Z', '+00:00'))
+    except ValueError:
+        return UNKNOWN_TIMESTAMP
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _url_hash(article: Dict[str, Any]) -> int:
+    key = article.get('url') or f"{article.get('source_url', '')}#{article.get('title', '')}"
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _segment_paths(snapshot_dir: Path) -> List[Path]:
+    if not snapshot_dir.is_dir():
+        return []
+    return sorted(snapshot_dir.glob('*.col'))
+
+
+def _write_segment(articles: List[Dict[str, Any]], output_path: Path) -> None:
+    """Write articles to a single columnar segment file."""
+    sources: Dict[str, int] = {}
+    fixed = {name: array(code) for name, code in FIXED_COLUMNS.items()}
+    heaps = {name: bytearray() for name in STRING_COLUMNS}
+    offsets = {name: array('Q', [0]) for name in STRING_COLUMNS}
+
+    for article in articles:
+        fixed['published'].append(_timestamp(article.get('published', 'Unknown')))
+        fixed['source_id'].append(sources.setdefault(article.get('source', ''), len(sources)))
+        fixed['score'].append(int(score_article(article)[0]))
+        fixed['date_verified'].append(1 if article.get('date_verified', False) else 0)
+        fixed['url_hash'].append(_url_hash(article))
+        for name in STRING_COLUMNS:
+            value = article.get(name, '')
+            if name == 'description':
+                # Prefer the normalized description over the raw feed markup
+                value = article.get('description_text', value)
+            heaps[name] += str(value).encode('utf-8')
+            offsets[name].append(len(heaps[name]))
+
+    # Serialize column blobs in a fixed order
+    blobs = []
+    for name in FIXED_COLUMNS:
+        blobs.append((name, fixed[name].tobytes()))
+    for name in STRING_COLUMNS:
+        blobs.append((f"{name}.offsets", offsets[name].tobytes()))
+        blobs.append((f"{name}.heap", bytes(heaps[name])))
+
+    if sys.byteorder != 'little':
+        raise RuntimeError("Columnar snapshots are only supported on little-endian hosts")
+
+    # The header stores absolute offsets, which depend on the header's own length
+    def build_header(data_start: int) -> bytes:
+        columns = {}
+        pos = data_start
+        for name, blob in blobs:
+            columns[name] = {'offset': pos, 'length': len(blob)}
+            pos = _align(pos + len(blob))
+        return json.dumps({
+            'version': FORMAT_VERSION,
+            'rows': len(articles),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'sources': sorted(sources, key=sources.get),
+            'columns': columns
+        }, ensure_ascii=False).encode('utf-8')
+
+    header = build_header(0)
+    while True:
+        data_start = _align(16 + len(header))
+        candidate = build_header(data_start)
+        if len(candidate) == len(header):
+            header = candidate
+            break
+        header = candidate
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix(output_path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        for name, blob in blobs:
+            f.write(b'\0' * (_align(f.tell()) - f.tell()))
+            f.write(blob)
+    tmp_path.replace(output_path)
+
+
+def write_snapshot(articles: List[Dict[str, Any]], snapshot_dir: Path) -> None:
+    """Replace the snapshot with a single segment holding `articles`."""
+    if snapshot_dir.is_file():
+        snapshot_dir.unlink()
+    old_segments = _segment_paths(snapshot_dir)
+    seen = set()
+    unique = []
+    for article in articles:
+        url_hash = _url_hash(article)
+        if url_hash not in seen:
+            seen.add(url_hash)
+            unique.append(article)
+    # Number past the existing segments so readers never see a half-replaced snapshot
+    seq = int(old_segments[-1].stem) + 1 if old_segments else 1
+    _write_segment(unique, snapshot_dir / f"{seq:06d}.col")
+    for path in old_segments:
+        path.unlink()
+
+
+def append_snapshot(articles: List[Dict[str, Any]], snapshot_dir: Path) -> Optional[int]:
+    """
+    Append articles not already in the snapshot as a new segment.
+    Only the stored url_hash columns are scanned; existing rows are never rewritten.
+    Returns the number of rows added, or None if there is no snapshot to append to.
+    """
+    segment_paths = _segment_paths(snapshot_dir)
+    if not segment_paths:
+        return None
+
+    seen = set()
+    for path in segment_paths:
+        with ColumnarSnapshot(path) as segment:
+            seen.update(segment.column('url_hash'))
+
+    new_articles = []
+    for article in articles:
+        url_hash = _url_hash(article)
+        if url_hash not in seen:
+            seen.add(url_hash)
+            new_articles.append(article)
+
+    if new_articles:
+        seq = int(segment_paths[-1].stem) + 1
+        _write_segment(new_articles, snapshot_dir / f"{seq:06d}.col")
+    return len(new_articles)
+
+
+class ColumnarSnapshot:
+    """Read-only, memory-mapped view of one snapshot segment."""
+
+    def __init__(self, path: Path):
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:8] != MAGIC:
+            self.close()
+            raise ValueError(f"Not a columnar snapshot: {path}")
+
+        header_len = struct.unpack_from('<Q', self._mmap, 8)[0]
+        self.header = json.loads(self._mmap[16:16 + header_len].decode('utf-8'))
+        if self.header.get('version') != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported snapshot version: {self.header.get('version')}")
+
+        self.rows = self.header['rows']
+        self.sources: List[str] = self.header['sources']
+        self._views: Dict[str, memoryview] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        # Views must be released before the mmap can be closed
+        for view in getattr(self, '_views', {}).values():
+            view.release()
+        self._views = {}
+        self._mmap.close()
+        self._file.close()
+
+    def _raw(self, name: str) -> memoryview:
+        column = self.header['columns'][name]
+        return memoryview(self._mmap)[column['offset']:column['offset'] + column['length']]
+
+    def column(self, name: str) -> memoryview:
+        """Zero-copy typed view of a fixed-width column or string offsets."""
+        if name not in self._views:
+            if name in FIXED_COLUMNS:
+                self._views[name] = self._raw(name).cast(FIXED_COLUMNS[name])
+            elif name.endswith('.offsets'):
+                self._views[name] = self._raw(name).cast('Q')
+            else:
+                self._views[name] = self._raw(name)
+        return self._views[name]
+
+    def string(self, name: str, row: int) -> str:
+        """Decode a single value from a string heap."""
+        offsets = self.column(f"{name}.offsets")
+        heap = self.column(f"{name}.heap")
+        return bytes(heap[offsets[row]:offsets[row + 1]]).decode('utf-8')
+
+
+def open_snapshot(snapshot_dir: Path) -> List[ColumnarSnapshot]:
+    """Open every segment of a snapshot. Callers must close the returned segments."""
+    segment_paths = _segment_paths(snapshot_dir)
+    if not segment_paths:
+        raise FileNotFoundError(f"No snapshot segments in {snapshot_dir}")
+    return [ColumnarSnapshot(path) for path in segment_paths]
+
+
+def count_per_source_per_day(segments: List[ColumnarSnapshot]) -> Counter:
+    """Count articles by (day number, source name) scanning only two columns."""
+    counts = Counter()
+    for segment in segments:
+        published = segment.column('published')
+        source_ids = segment.column('source_id')
+        day_sids = Counter(
+            (ts // SECONDS_PER_DAY, sid)
+            for ts, sid in zip(published, source_ids)
+            if ts != UNKNOWN_TIMESTAMP
+        )
+        # Source ids are local to each segment
+        for (day, sid), count in day_sids.items():
+            counts[(day, segment.sources[sid])] += count
+    return counts
+
+
+def print_report(segments: List[ColumnarSnapshot], min_score: int = 60, per_day: bool = False) -> None:
+    """Print summary statistics for a snapshot."""
+    start = time.perf_counter()
+
+    rows = sum(segment.rows for segment in segments)
+    unverified = rows - sum(sum(segment.column('date_verified')) for segment in segments)
+    high_scoring = sum(1 for segment in segments for s in segment.column('score') if s >= min_score)
+    dated = [ts for segment in segments for ts in segment.column('published') if ts != UNKNOWN_TIMESTAMP]
+    per_source_day = count_per_source_per_day(segments)
+    per_source = Counter()
+    for (_, source), count in per_source_day.items():
+        per_source[source] += count
+    sources = {source for segment in segments for source in segment.sources}
+
+    elapsed = time.perf_counter() - start
+
+    print(f"Articles: {rows} ({len(segments)} segments)")
+    print(f"Sources: {len(sources)}")
+    if dated:
+        first = datetime.fromtimestamp(min(dated), tz=timezone.utc).date()
+        last = datetime.fromtimestamp(max(dated), tz=timezone.utc).date()
+        print(f"Date range: {first} to {last} ({len({ts // SECONDS_PER_DAY for ts in dated})} days)")
+    print(f"Unverified dates (date_verified: false): {unverified}")
+    print(f"Scoring {min_score}+: {high_scoring}")
+
+    print("\nArticles per source:")
+    for source, count in per_source.most_common():
+        print(f"  {count:6d}  {source}")
+
+    if per_day:
+        print("\nArticles per source per day:")
+        for (day, source), count in sorted(per_source_day.items(), key=lambda x: (-x[0][0], -x[1])):
+            day_str = datetime.fromtimestamp(day * SECONDS_PER_DAY, tz=timezone.utc).date().isoformat()
+            print(f"  {day_str}  {count:5d}  {source}")
+
+    print(f"\n(scanned in {elapsed * 1000:.1f} ms)")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description='Build and query columnar article snapshots for AI agent digest'
+    )
+    parser.add_argument(
+        '--snapshot',
+        type=Path,
+        default=Path('ai-digest/data/articles.snapshot'),
+        help='Columnar snapshot directory'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser(
+        'build', help='Rebuild the snapshot as one segment from the archive or a JSON file')
+    build_parser.add_argument(
+        '--archive',
+        type=Path,
+        default=Path('ai-digest/data/archive'),
+        help='Archive directory to read articles from'
+    )
+    build_parser.add_argument('--input', type=Path, help='Read a JSON file instead of the archive')
+
+    stats_parser = subparsers.add_parser('stats', help='Report article statistics from a snapshot')
+    stats_parser.add_argument('--min-score', type=int, default=60, help='Score threshold (default: 60)')
+    stats_parser.add_argument('--per-day', action='store_true', help='Break counts down per source per day')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        if args.input:
+            from article_archive import load_json_articles
+            articles = load_json_articles(args.input)
+        else:
+            from article_archive import read_range
+            articles = read_range(args.archive, include_undated=True)
+        write_snapshot(articles, args.snapshot)
+        print(f"✓ Wrote {len(articles)} articles to {args.snapshot}")
+    elif args.command == 'stats':
+        try:
+            segments = open_snapshot(args.snapshot)
+        except FileNotFoundError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        try:
+            print_report(segments, args.min_score, args.per_day)
+        finally:
+            for segment in segments:
+                segment.close()
+
+
+if __name__ == '__main__':
+    # Ensure UTF-8 encoding for stdout on Windows (only when run as a script,
+    # so importing this module never replaces the streams)
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    main()
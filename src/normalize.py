@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Description normalization for AI Agent Daily Digest.
+Extracts plain text from feed descriptions once per article and removes per-feed
+boilerplate using templates learned from each feed's articles. Each description's
+edge skeletons and clean text are cached by content hash, so repeated collection
+runs skip the HTML parsing both when learning templates and when removing them.
+
+Boilerplate templates are "skeletons" of a description's leading or trailing
+line/sentence, with link text and numbers masked, e.g.:
+    'the post {link} appeared first on {link}.'
+    'arxiv:#.#v# announce type: new'
+Each template records the last day it was seen. Templates unseen for
+TEMPLATE_RETENTION_DAYS expire, and a feed's template is dropped sooner once
+the feed has kept publishing without it for TEMPLATE_ABSENT_DAYS.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from collections import Counter
+from datetime import date, timedelta
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from article_archive import cached_json
+
+# Learned templates need this many matching articles, and this share of the feed
+MIN_SUPPORT = 3
+MIN_SHARE = 0.05
+# Skeletons repeated by this many feeds apply to every feed, including new ones
+MIN_SOURCES = 3
+SHARED_TEMPLATES = '*'
+CACHE_RETENTION_DAYS = 30
+TEMPLATE_RETENTION_DAYS = 30
+# A feed that keeps publishing without a template for this long has dropped it
+TEMPLATE_ABSENT_DAYS = 7
+
+BLOCK_TAGS = frozenset([
+    'p', 'div', 'br', 'li', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'blockquote', 'pre', 'tr', 'table', 'hr', 'figure', 'figcaption', 'section'
+])
+SKIP_TAGS = frozenset(['script', 'style'])
+
+# Link text is wrapped in these markers while extracting, so skeletons can mask it
+LINK_START, LINK_END = '\x02', '\x03'
+LINK_RE = re.compile(f'{LINK_START}[^{LINK_END}]*{LINK_END}')
+LINK_LIST_RE = re.compile(r'\{link\}(?:[\s,;|/]+\{link\})+')
+NUMBER_RE = re.compile(r'\d+')
+LITERAL_WORD_RE = re.compile(r'[a-z]{3,}')
+SPACE_RE = re.compile(r'[ \t\r\f\v\xa0]+')
+SENTENCE_RE = re.compile(r'(?<=[.!?…])\s+(?=\S)')
+
+
+class _TextExtractor(HTMLParser):
+    """Collects text with line breaks at block elements and marked link text."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append('\n')
+        elif tag == 'a':
+            self.parts.append(LINK_START)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self.parts.append('\n')
+        elif tag == 'a':
+            self.parts.append(LINK_END)
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+
+
+def _marked_lines(raw: str) -> List[str]:
+    """Non-empty text lines of a description, with link text still marked."""
+    if '<' in raw or '&' in raw:
+        extractor = _TextExtractor()
+        extractor.feed(raw)
+        extractor.close()
+        text = ''.join(extractor.parts)
+    else:
+        # Plain-text descriptions skip the parser entirely
+        text = raw
+    lines = (SPACE_RE.sub(' ', line).strip() for line in text.split('\n'))
+    return [line for line in lines if line.strip(LINK_START + LINK_END + ' ')]
+
+
+def _plain(marked: str) -> str:
+    return marked.replace(LINK_START, '').replace(LINK_END, '')
+
+
+def skeleton(marked: str) -> str:
+    """Template key for a line or sentence: links and numbers masked, lowercased."""
+    text = LINK_RE.sub('{link}', marked)
+    text = LINK_LIST_RE.sub('{link}', text)
+    text = NUMBER_RE.sub('#', text)
+    return text.strip().lower()
+
+
+def _sentences(marked_line: str) -> List[str]:
+    return [s for s in SENTENCE_RE.split(marked_line) if s]
+
+
+def _edge_skeletons(lines: List[str]) -> List[Tuple[str, str]]:
+    """Candidate (position, skeleton) pairs for a description's edges."""
+    if len(lines) == 0:
+        return []
+    first_sentences = _sentences(lines[0])
+    last_sentences = _sentences(lines[-1])
+    candidates = {('head', skeleton(lines[0])), ('tail', skeleton(lines[-1]))}
+    if len(first_sentences) > 1:
+        candidates.add(('head', skeleton(first_sentences[0])))
+    if len(last_sentences) > 1:
+        candidates.add(('tail', skeleton(last_sentences[-1])))
+    return list(candidates)
+
+
+def _is_template(key: str) -> bool:
+    """Skeletons must keep some literal wording, not just masked links and numbers."""
+    return bool(LITERAL_WORD_RE.search(key.replace('{link}', '')))
+
+
+def _copy_templates(templates: Optional[Dict[str, Dict[str, Any]]], today: str
+                    ) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """Copy templates as {source: {position: {skeleton: last seen day}}}."""
+    copied = {}
+    for source, positions in (templates or {}).items():
+        copied[source] = {}
+        for position in ('head', 'tail'):
+            keys = positions.get(position, {})
+            # Older files stored plain lists without dates; start their clock today
+            copied[source][position] = dict(keys) if isinstance(keys, dict) else dict.fromkeys(keys, today)
+    return copied
+
+
+def learn_templates(articles: List[Dict[str, Any]],
+                    templates: Optional[Dict[str, Dict[str, Any]]] = None,
+                    today: Optional[date] = None,
+                    cache: Optional['NormalizationCache'] = None) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """
+    Learn leading/trailing boilerplate per source and merge it into `templates`.
+    A skeleton becomes a template when it recurs across enough of a feed's articles,
+    and a shared template when it recurs within each of MIN_SOURCES feeds.
+    Templates seen in these articles are refreshed, however rare. A source template
+    unseen for TEMPLATE_ABSENT_DAYS is dropped when MIN_SUPPORT of the source's
+    articles still lack it, and any template unseen for TEMPLATE_RETENTION_DAYS expires.
+    Pass the `cache` used for normalization to share its parsed descriptions.
+    """
+    today = today or date.today()
+    cache = cache or NormalizationCache()
+    today_str = today.isoformat()
+    templates = _copy_templates(templates, today_str)
+    per_source: Dict[str, Counter] = {}
+    totals: Counter = Counter()
+
+    for article in articles:
+        source = article.get('source', '')
+        edges = cache.edges(str(article.get('description', '')))
+        if not edges:
+            continue
+        totals[source] += 1
+        per_source.setdefault(source, Counter()).update(edges)
+
+    def add(source: str, position: str, key: str) -> None:
+        templates.setdefault(source, {'head': {}, 'tail': {}})[position][key] = today_str
+
+    # Sources in which a skeleton repeats; a story syndicated once to several feeds does not count
+    sources_per_key: Dict[Tuple[str, str], int] = Counter()
+    seen = set()
+    absent_since = (today - timedelta(days=TEMPLATE_ABSENT_DAYS)).isoformat()
+    for source, counts in per_source.items():
+        seen.update(counts)
+        learned = templates.get(source, {})
+        for position in ('head', 'tail'):
+            for key, last_seen in list(learned.get(position, {}).items()):
+                if (position, key) in counts:
+                    learned[position][key] = today_str
+                elif totals[source] >= MIN_SUPPORT and last_seen < absent_since:
+                    # Run after run of this feed's articles no longer carry it
+                    del learned[position][key]
+
+        for (position, key), count in counts.items():
+            if count < MIN_SUPPORT or not _is_template(key):
+                continue
+            sources_per_key[(position, key)] += 1
+            if count >= MIN_SHARE * totals[source]:
+                add(source, position, key)
+
+    shared = templates.get(SHARED_TEMPLATES, {})
+    for position in ('head', 'tail'):
+        for key in shared.get(position, {}):
+            if (position, key) in seen:
+                shared[position][key] = today_str
+    for (position, key), sources in sources_per_key.items():
+        if sources >= MIN_SOURCES:
+            add(SHARED_TEMPLATES, position, key)
+
+    oldest = (today - timedelta(days=TEMPLATE_RETENTION_DAYS)).isoformat()
+    for source in list(templates):
+        for position in ('head', 'tail'):
+            templates[source][position] = {k: seen for k, seen in templates[source][position].items()
+                                           if seen >= oldest}
+        if not templates[source]['head'] and not templates[source]['tail']:
+            del templates[source]
+
+    return templates
+
+
+def forget_templates(templates: Dict[str, Dict[str, Any]], keys: List[str]) -> int:
+    """Remove skeletons from every source, including the shared set. Returns how many were removed."""
+    removed = 0
+    for positions in templates.values():
+        for position in ('head', 'tail'):
+            for key in keys:
+                if key in positions.get(position, {}):
+                    del positions[position][key]
+                    removed += 1
+    return removed
+
+
+def templates_for(templates: Dict[str, Dict[str, Any]], source: str) -> Dict[str, List[str]]:
+    """A source's own templates combined with the shared ones."""
+    own = templates.get(source, {})
+    shared = templates.get(SHARED_TEMPLATES, {})
+    return {position: sorted(set(own.get(position, ())) | set(shared.get(position, ())))
+            for position in ('head', 'tail')}
+
+
+def search_text(article: Dict[str, Any]) -> str:
+    """Lowercased title and clean description for keyword matching (computed, never stored)."""
+    description = article.get('description_text', article.get('description', ''))
+    return f"{article.get('title', '')} {description}".lower()
+
+
+def normalize_description(raw: str, source_templates: Optional[Dict[str, List[str]]] = None) -> str:
+    """Plain text of a feed description with the source's boilerplate removed."""
+    return _strip_boilerplate(_marked_lines(raw or ''), source_templates)
+
+
+def _strip_boilerplate(lines: List[str], source_templates: Optional[Dict[str, List[str]]]) -> str:
+    """Plain text of marked lines after removing leading/trailing template matches (modifies `lines`)."""
+    head = set(source_templates.get('head', [])) if source_templates else set()
+    tail = set(source_templates.get('tail', [])) if source_templates else set()
+
+    changed = bool(head or tail)
+    while changed and lines:
+        changed = False
+        # Whole boilerplate lines, never removing the only remaining line
+        if len(lines) > 1 and skeleton(lines[0]) in head:
+            lines.pop(0)
+            changed = True
+        if len(lines) > 1 and skeleton(lines[-1]) in tail:
+            lines.pop()
+            changed = True
+        # Boilerplate sentences inside the first or last line
+        first = _sentences(lines[0])
+        if len(first) > 1 and skeleton(first[0]) in head:
+            lines[0] = ' '.join(first[1:])
+            changed = True
+        last = _sentences(lines[-1])
+        if len(last) > 1 and skeleton(last[-1]) in tail:
+            lines[-1] = ' '.join(last[:-1])
+            changed = True
+
+    return '\n'.join(_plain(line) for line in lines)
+
+
+class NormalizationCache:
+    """
+    Per-description results keyed by a hash of the raw text: the edge skeletons
+    used for learning, and the normalized text with the hash of the templates it
+    was stripped with. The description is parsed only when one of them is missing.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self.today = date.today().isoformat()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        # Lines parsed during this run, so learning and normalization parse once
+        self._lines: Dict[str, List[str]] = {}
+        if path is not None and path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                # Older files keyed text by raw text and templates together; those entries are not reused
+                self.entries = {k: v for k, v in json.load(f).items() if 'edges' in v}
+
+    @staticmethod
+    def key(raw: str) -> str:
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+    @staticmethod
+    def templates_key(source_templates: Optional[Dict[str, List[str]]]) -> str:
+        encoded = json.dumps(source_templates or {}, sort_keys=True).encode('utf-8')
+        return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+    def _entry(self, raw: str) -> Tuple[str, Dict[str, Any]]:
+        key = self.key(raw)
+        entry = self.entries.get(key)
+        if entry is None:
+            lines = self._lines[key] = _marked_lines(raw)
+            # Single-line descriptions are all content; repeats there are not boilerplate
+            learnable = len(lines) >= 2 or len(_sentences(lines[0]) if lines else []) >= 2
+            entry = {'edges': _edge_skeletons(lines) if learnable else []}
+            self.entries[key] = entry
+        entry['used'] = self.today
+        return key, entry
+
+    def edges(self, raw: str) -> List[Tuple[str, str]]:
+        """(position, skeleton) candidates for template learning; empty if the description has none."""
+        return [tuple(edge) for edge in self._entry(raw)[1]['edges']]
+
+    def normalize(self, raw: str, source_templates: Optional[Dict[str, List[str]]] = None) -> str:
+        key, entry = self._entry(raw)
+        templates_key = self.templates_key(source_templates)
+        if entry.get('templates') != templates_key or 'text' not in entry:
+            lines = self._lines.pop(key, None) or _marked_lines(raw)
+            entry['text'] = _strip_boilerplate(lines, source_templates)
+            entry['templates'] = templates_key
+        return entry['text']
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        # Drop entries no collection run has needed recently
+        oldest = (date.fromisoformat(self.today) - timedelta(days=CACHE_RETENTION_DAYS)).isoformat()
+        self.entries = {k: v for k, v in self.entries.items() if v.get('used', '') >= oldest}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def load_templates(path: Path) -> Dict[str, Dict[str, Any]]:
+    if not path.exists():
+        return {}
+    return cached_json(path)
+
+
+def save_templates(path: Path, templates: Dict[str, Dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(templates, f, indent=2, ensure_ascii=False, sort_keys=True)
+
+
+def normalize_articles(articles: List[Dict[str, Any]], templates_path: Path,
+                       cache_path: Optional[Path] = None,
+                       save: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Learn templates from these articles, then add a `description_text` field
+    to each one. The raw `description` is left unchanged.
+    With save=False the templates and cache files are not written. Returns the templates.
+    """
+    cache = NormalizationCache(cache_path)
+    templates = learn_templates(articles, load_templates(templates_path), cache=cache)
+    if save:
+        save_templates(templates_path, templates)
+
+    for article in articles:
+        source_templates = templates_for(templates, article.get('source', ''))
+        article['description_text'] = cache.normalize(str(article.get('description', '')), source_templates)
+    if save:
+        cache.save()
+
+    return templates
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description='Extract clean text from collected article descriptions for AI agent digest'
+    )
+    parser.add_argument(
+        '--templates',
+        type=Path,
+        default=Path('ai-digest/data/boilerplate_templates.json'),
+        help='Path to learned per-feed boilerplate templates'
+    )
+    parser.add_argument(
+        '--cache',
+        type=Path,
+        default=Path('ai-digest/data/normalized_cache.json'),
+        help='Path to the normalized text cache'
+    )
+    parser.add_argument(
+        'input',
+        type=Path,
+        nargs='?',
+        default=Path('ai-digest/data/collected_articles.json'),
+        help='Collected articles JSON to normalize in place'
+    )
+    parser.add_argument('--dry-run', action='store_true', help='Report savings without writing any file')
+    parser.add_argument(
+        '--forget',
+        action='append',
+        default=[],
+        metavar='SKELETON',
+        help='Remove a learned template from every source, e.g. "the post {link} appeared first on {link}." '
+             '(repeatable; no articles are read)'
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.forget:
+        templates = load_templates(args.templates)
+        removed = forget_templates(templates, args.forget)
+        if removed and not args.dry_run:
+            save_templates(args.templates, templates)
+        print(f"Removed {removed} templates from {args.templates}")
+        return
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    articles = data.get('articles', []) if isinstance(data, dict) else data
+
+    templates = normalize_articles(articles, args.templates, args.cache, save=not args.dry_run)
+
+    raw_chars = sum(len(str(a.get('description', ''))) for a in articles)
+    text_chars = sum(len(a['description_text']) for a in articles)
+    print(f"Normalized {len(articles)} descriptions: {raw_chars:,} -> {text_chars:,} characters")
+    print(f"Boilerplate templates: {sum(len(t['head']) + len(t['tail']) for t in templates.values())} "
+          f"across {len(templates)} sources")
+
+    if not args.dry_run:
+        with open(args.input, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        print(f"✓ Saved to: {args.input}")
+
+
+if __name__ == '__main__':
+    # Ensure UTF-8 encoding for stdout on Windows (only when run as a script,
+    # so importing this module never replaces the streams)
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    main()
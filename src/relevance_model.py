@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Learned relevance scorer for AI Agent Daily Digest.
+Hashes title, description and domain tokens into a fixed-size feature space
+and scores them with a logistic regression model trained on past digest
+selections. Weights are stored as a compact float32 array.
+
+Model file layout:
+    8 bytes   magic b'AIDREL1\\0'
+    8 bytes   header length (uint64, little-endian)
+    N bytes   JSON header: feature bits, bias, training summary
+    ...       float32 weights (2 ** feature bits)
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import struct
+import sys
+import time
+import zlib
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+from article_archive import load_json_articles, partition_key, read_range, UNDATED_PARTITION
+from trends import tokenize
+
+MAGIC = b'AIDREL1\0'
+FORMAT_VERSION = 1
+FEATURE_BITS = 18
+DEFAULT_MODEL_PATH = Path('ai-digest/data/relevance_model.bin')
+
+# Days before a digest whose collected articles count as reviewed candidates
+CANDIDATE_WINDOW_DAYS = 2
+
+# Below this many URL-matched selections, held-out precision is mostly noise
+MIN_BENCH_POSITIVES = 30
+
+DIGEST_DATE_RE = re.compile(r'digest-(\d{4}-\d{2}-\d{2})\.md$')
+MARKDOWN_LINK_RE = re.compile(r'\]\((https?://[^)\s]+)\)')
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form for matching digest links to collected article URLs."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return f"{host}{parts.path.rstrip('/')}"
+
+
+def extract_features(article: Dict[str, Any], bits: int = FEATURE_BITS) -> Dict[int, float]:
+    """Hash an article's tokens and bigrams into a sparse, L2-normalized vector."""
+    mask = (1 << bits) - 1
+    features: Dict[int, float] = {}
+
+    def add(feature: str) -> None:
+        h = zlib.crc32(feature.encode('utf-8'))
+        # The top hash bit picks the sign, reducing collision bias
+        sign = -1.0 if h & 0x80000000 else 1.0
+        index = h & mask
+        features[index] = features.get(index, 0.0) + sign
+
+    texts = (('t', article.get('title', '')),
+             ('d', article.get('description_text', article.get('description', ''))))
+    for prefix, text in texts:
+        tokens = tokenize(str(text))
+        for token in set(tokens):
+            add(f"{prefix}:{token}")
+        for bigram in set(zip(tokens, tokens[1:])):
+            add(f"{prefix}:{bigram[0]} {bigram[1]}")
+
+    host = urlsplit(article.get('url', article.get('link', ''))).netloc.lower()
+    if host:
+        add(f"u:{host[4:] if host.startswith('www.') else host}")
+
+    norm = math.sqrt(sum(v * v for v in features.values())) or 1.0
+    return {i: v / norm for i, v in features.items() if v}
+
+
+class RelevanceModel:
+    """Hashed-feature logistic regression relevance scorer."""
+
+    def __init__(self, bits: int = FEATURE_BITS, weights: Optional[array] = None,
+                 bias: float = 0.0, metadata: Optional[Dict[str, Any]] = None):
+        self.bits = bits
+        self.weights = weights if weights is not None else array('f', bytes(4 << bits))
+        self.bias = bias
+        self.metadata = metadata or {}
+
+    def probability(self, article: Dict[str, Any]) -> float:
+        weights = self.weights
+        z = self.bias + sum(weights[i] * v for i, v in extract_features(article, self.bits).items())
+        # Clamp to keep exp() in range
+        return 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, z))))
+
+    def score_article(self, article: Dict[str, Any]) -> int:
+        """Score article relevance (0-100), comparable to the keyword scorers."""
+        return int(round(100 * self.probability(article)))
+
+    def score_articles(self, articles: List[Dict[str, Any]]) -> List[int]:
+        """Score a batch of articles."""
+        return [self.score_article(a) for a in articles]
+
+    def train(self, examples: List[Tuple[Dict[str, Any], int]], epochs: int = 15,
+              learning_rate: float = 0.5, l2: float = 1e-5, seed: int = 42) -> None:
+        """Fit with SGD on log loss, weighting classes to balance rare positives."""
+        vectors = [(extract_features(a, self.bits), label) for a, label in examples]
+        positives = sum(label for _, label in vectors)
+        negatives = len(vectors) - positives
+        if not positives or not negatives:
+            raise ValueError("Training needs both selected and unselected articles")
+        class_weight = {1: len(vectors) / (2 * positives), 0: len(vectors) / (2 * negatives)}
+
+        rng = random.Random(seed)
+        weights = self.weights
+        for epoch in range(epochs):
+            rng.shuffle(vectors)
+            rate = learning_rate / (1 + epoch)
+            for features, label in vectors:
+                z = self.bias + sum(weights[i] * v for i, v in features.items())
+                p = 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, z))))
+                gradient = (p - label) * class_weight[label]
+                for i, v in features.items():
+                    weights[i] -= rate * (gradient * v + l2 * weights[i])
+                self.bias -= rate * gradient
+
+        self.metadata.update({
+            'trained_at': datetime.now(timezone.utc).isoformat(),
+            'examples': len(vectors),
+            'positives': positives,
+            'epochs': epochs
+        })
+
+    def save(self, path: Path) -> None:
+        header = json.dumps({
+            'version': FORMAT_VERSION,
+            'bits': self.bits,
+            'bias': self.bias,
+            'metadata': self.metadata
+        }).encode('utf-8')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            f.write(self.weights.tobytes())
+
+    @classmethod
+    def load(cls, path: Path) -> 'RelevanceModel':
+        with open(path, 'rb') as f:
+            if f.read(8) != MAGIC:
+                raise ValueError(f"Not a relevance model: {path}")
+            header_len = struct.unpack('<Q', f.read(8))[0]
+            header = json.loads(f.read(header_len).decode('utf-8'))
+            if header.get('version') != FORMAT_VERSION:
+                raise ValueError(f"Unsupported model version: {header.get('version')}")
+            weights = array('f')
+            weights.frombytes(f.read())
+        if len(weights) != 1 << header['bits']:
+            raise ValueError(f"Truncated relevance model: {path}")
+        return cls(header['bits'], weights, header['bias'], header['metadata'])
+
+
+# (resolved path, mtime, size) of the loaded default model, and the model
+_default_model: Optional[Tuple[Tuple[str, int, int], RelevanceModel]] = None
+
+
+def load_default_model(path: Optional[Path] = None) -> RelevanceModel:
+    """
+    Load the trained model, resolved against the current directory. It is kept
+    while the file is unchanged, so a warm worker picks up a retrained model and
+    fails cleanly (FileNotFoundError) once the file is removed.
+    """
+    global _default_model
+    path = Path(path or DEFAULT_MODEL_PATH).resolve()
+    stat = path.stat()
+    stamp = (str(path), stat.st_mtime_ns, stat.st_size)
+    if _default_model is None or _default_model[0] != stamp:
+        _default_model = (stamp, RelevanceModel.load(path))
+    return _default_model[1]
+
+
+def score_article(article: Dict[str, Any]) -> int:
+    """Score article relevance (0-100) with the default trained model."""
+    return load_default_model().score_article(article)
+
+
+def parse_digest(path: Path) -> List[Dict[str, Any]]:
+    """Extract the selected articles (title, url, summary) from a digest."""
+    entries = []
+    for section in re.split(r'^### ', path.read_text(encoding='utf-8'), flags=re.MULTILINE)[1:]:
+        lines = section.splitlines()
+        link = MARKDOWN_LINK_RE.search(section)
+        if not link:
+            continue
+        # First plain paragraph after the metadata lines is the summary
+        summary = next((line.strip() for line in lines[1:]
+                        if line.strip() and not line.lstrip().startswith(('**', '[', '*', '-', '#', '|'))), '')
+        entries.append({'title': lines[0].strip(), 'url': link.group(1), 'description': summary})
+    return entries
+
+
+def build_training_set(digests_dir: Path, articles: List[Dict[str, Any]]
+                       ) -> Tuple[List[Tuple[Dict[str, Any], int]], List[Dict[str, Any]]]:
+    """
+    Label collected articles by whether a digest selected them (matched by URL).
+    Only articles published in the days leading up to a digest are used as
+    negatives. Returns (labeled collected articles, digest entries that match
+    no collected article). The unmatched entries carry digest prose rather than
+    feed text, so they must never be used for evaluation.
+    """
+    selected: Dict[str, Dict[str, Any]] = {}
+    digest_days = set()
+    for digest_path in sorted(digests_dir.rglob('digest-*.md')):
+        match = DIGEST_DATE_RE.search(digest_path.name)
+        if not match:
+            continue
+        digest_day = date.fromisoformat(match.group(1))
+        for offset in range(CANDIDATE_WINDOW_DAYS + 1):
+            digest_days.add((digest_day - timedelta(days=offset)).isoformat())
+        for entry in parse_digest(digest_path):
+            selected.setdefault(normalize_url(entry['url']), entry)
+
+    examples = []
+    matched = set()
+    for article in articles:
+        key = normalize_url(article.get('url', ''))
+        if key in selected:
+            matched.add(key)
+            examples.append((article, 1))
+        elif partition_key(article) in digest_days:
+            examples.append((article, 0))
+
+    unmatched = [entry for key, entry in selected.items() if key not in matched]
+    return examples, unmatched
+
+
+def load_candidates(archive_dir: Optional[Path], inputs: List[Path]) -> List[Dict[str, Any]]:
+    """Collected articles from the archive and/or loose JSON snapshots, de-duplicated by URL."""
+    by_url: Dict[str, Dict[str, Any]] = {}
+    if archive_dir is not None and archive_dir.is_dir():
+        for article in read_range(archive_dir, include_undated=False):
+            by_url[normalize_url(article.get('url', ''))] = article
+    for input_path in inputs:
+        for article in load_json_articles(input_path):
+            if partition_key(article) != UNDATED_PARTITION:
+                by_url.setdefault(normalize_url(article.get('url', '')), article)
+    return list(by_url.values())
+
+
+def _keyword_scorers() -> Dict[str, Any]:
+    """The pipeline's hand-written scorers, normalized to return an int."""
+    repo_dir = str(Path(__file__).resolve().parent.parent)
+    if repo_dir not in sys.path:
+        sys.path.append(repo_dir)
+    import analyze_articles
+    import analyze_today
+    import filter_and_generate
+
+    return {
+        'analyze_articles': lambda a: analyze_articles.score_article(a)[0],
+        'analyze_today': analyze_today.score_article,
+        'filter_and_generate': filter_and_generate.score_article,
+    }
+
+
+def _precision(scored: List[Tuple[float, int]], threshold: float) -> Tuple[float, float, int]:
+    """Precision and recall of score >= threshold, plus number kept."""
+    kept = [label for score, label in scored if score >= threshold]
+    positives = sum(label for _, label in scored)
+    precision = sum(kept) / len(kept) if kept else 0.0
+    recall = sum(kept) / positives if positives else 0.0
+    return precision, recall, len(kept)
+
+
+def _precision_at_k(scored: List[Tuple[float, int]], k: int) -> float:
+    top = sorted(scored, key=lambda x: x[0], reverse=True)[:k]
+    return sum(label for _, label in top) / len(top) if top else 0.0
+
+
+def check_labels(examples: List[Tuple[Dict[str, Any], int]]) -> Optional[str]:
+    """Explain why the examples cannot train a model, or None if they can."""
+    positives = sum(label for _, label in examples)
+    if not examples:
+        return "no collected articles fall in the days before any digest"
+    if not positives:
+        return "no collected article URL matches a digest selection"
+    if positives == len(examples):
+        return "every labeled article was selected; no unselected candidates to learn from"
+    return None
+
+
+def _stratified_folds(examples: List[Tuple[Dict[str, Any], int]], folds: int,
+                      seed: int) -> List[List[Tuple[Dict[str, Any], int]]]:
+    """Split examples into folds with positives spread evenly across them."""
+    rng = random.Random(seed)
+    positives = [ex for ex in examples if ex[1]]
+    negatives = [ex for ex in examples if not ex[1]]
+    rng.shuffle(positives)
+    rng.shuffle(negatives)
+    return [positives[fold::folds] + negatives[fold::folds] for fold in range(folds)]
+
+
+def benchmark(examples: List[Tuple[Dict[str, Any], int]], folds: int = 5,
+              threshold: int = 60, seed: int = 42,
+              extra_positives: Optional[List[Dict[str, Any]]] = None) -> bool:
+    """
+    Compare cross-validated model precision and throughput against the keyword
+    scorers. Only collected articles are evaluated; `extra_positives` (digest
+    entries with no collected match) are added to the training folds only.
+    Returns False without printing results if there are too few matched selections.
+    """
+    extra = [(entry, 1) for entry in extra_positives or []]
+    positives = sum(label for _, label in examples)
+    if positives < max(MIN_BENCH_POSITIVES, folds):
+        print(f"Only {positives} collected articles match a digest selection by URL "
+              f"(need {max(MIN_BENCH_POSITIVES, folds)}); not enough for a meaningful benchmark.")
+        return False
+
+    fold_sets = _stratified_folds(examples, folds, seed)
+    k = max(1, positives // folds)
+
+    results: Dict[str, List[Tuple[float, int]]] = {'relevance_model': []}
+    p_at_k: Dict[str, List[float]] = {'relevance_model': []}
+    scorers = _keyword_scorers()
+    for name in scorers:
+        results[name] = []
+        p_at_k[name] = []
+
+    for fold, test in enumerate(fold_sets):
+        train = [ex for i, fold_set in enumerate(fold_sets) if i != fold for ex in fold_set] + extra
+        model = RelevanceModel()
+        model.train(train, seed=seed)
+
+        fold_scores = {'relevance_model': [(model.score_article(a), label) for a, label in test]}
+        for name, scorer in scorers.items():
+            fold_scores[name] = [(scorer(a), label) for a, label in test]
+        for name, scored in fold_scores.items():
+            results[name].extend(scored)
+            p_at_k[name].append(_precision_at_k(scored, k))
+
+    # Throughput over every collected example, using a model trained on all of them
+    model = RelevanceModel()
+    model.train(examples + extra, seed=seed)
+    articles = [a for a, _ in examples]
+    throughput = {}
+    for name, scorer in [('relevance_model', model.score_article)] + list(scorers.items()):
+        start = time.perf_counter()
+        for article in articles:
+            scorer(article)
+        throughput[name] = len(articles) / (time.perf_counter() - start)
+
+    print(f"Collected articles: {len(examples)} ({positives} selected, matched by URL), "
+          f"{folds}-fold stratified cross-validation")
+    if extra:
+        print(f"Unmatched digest entries: {len(extra)} (training folds only, never evaluated)")
+    print()
+    print(f"{'Scorer':<22}{'Precision':>10}{'Recall':>8}{'Kept':>7}{'P@' + str(k):>8}{'Articles/s':>13}")
+    print("-" * 68)
+    for name, scored in results.items():
+        precision, recall, kept = _precision(scored, threshold)
+        mean_p_at_k = sum(p_at_k[name]) / len(p_at_k[name])
+        print(f"{name:<22}{precision:>10.2f}{recall:>8.2f}{kept:>7d}{mean_p_at_k:>8.2f}{throughput[name]:>13,.0f}")
+    print(f"\n(Precision/recall at score >= {threshold}; P@{k} per held-out fold)")
+    return True
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description='Train and evaluate the learned relevance scorer for AI agent digest'
+    )
+    parser.add_argument(
+        '--model',
+        type=Path,
+        default=DEFAULT_MODEL_PATH,
+        help='Path to the relevance model file'
+    )
+    parser.add_argument(
+        '--digests',
+        type=Path,
+        default=Path('ai-digest/digests'),
+        help='Directory of past digests used as labels'
+    )
+    parser.add_argument(
+        '--archive',
+        type=Path,
+        default=Path('ai-digest/data/archive'),
+        help='Archive directory with collected articles'
+    )
+    parser.add_argument(
+        '--input',
+        type=Path,
+        action='append',
+        default=[],
+        help='Additional collected articles JSON (repeatable)'
+    )
+    parser.add_argument(
+        '--digest-entries',
+        action='store_true',
+        help='Also train on digest selections that match no collected article '
+             '(their text is digest prose, not feed text)'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = subparsers.add_parser('train', help='Train the model on past digest selections')
+    train_parser.add_argument('--epochs', type=int, default=15, help='Training epochs (default: 15)')
+
+    bench_parser = subparsers.add_parser('bench', help='Compare precision and throughput with keyword scorers')
+    bench_parser.add_argument('--folds', type=int, default=5, help='Cross-validation folds (default: 5)')
+    bench_parser.add_argument('--threshold', type=int, default=60, help='Score threshold (default: 60)')
+
+    score_parser = subparsers.add_parser('score', help='Score collected articles with the trained model')
+    score_parser.add_argument(
+        'articles',
+        type=Path,
+        nargs='?',
+        default=Path('ai-digest/data/collected_articles.json'),
+        help='Collected articles JSON to score'
+    )
+    score_parser.add_argument('--top', type=int, default=20, help='Number of articles to show (default: 20)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'bench' and args.folds < 2:
+        parser.error('--folds must be at least 2')
+
+    if args.command in ('train', 'bench'):
+        articles = load_candidates(args.archive, args.input)
+        examples, unmatched = build_training_set(args.digests, articles)
+        extra = unmatched if args.digest_entries else []
+        problem = check_labels(examples)
+        if problem:
+            print(f"Error: cannot {args.command}: {problem} "
+                  f"(digests: {args.digests}, archive: {args.archive})", file=sys.stderr)
+            sys.exit(1)
+        if args.command == 'train':
+            model = RelevanceModel()
+            model.train(examples + [(entry, 1) for entry in extra], epochs=args.epochs)
+            model.save(args.model)
+            print(f"✓ Trained on {len(examples) + len(extra)} articles "
+                  f"({model.metadata['positives']} selected), saved to {args.model}")
+        elif not benchmark(examples, args.folds, args.threshold, extra_positives=extra):
+            print(f"{len(unmatched)} digest selections match no collected article and are never "
+                  "evaluated. Keep the archive enabled so future selections can be matched.")
+            sys.exit(1)
+    elif args.command == 'score':
+        if not args.model.exists():
+            print(f"Error: no relevance model at {args.model} (run: relevance_model.py train)", file=sys.stderr)
+            sys.exit(1)
+        model = RelevanceModel.load(args.model)
+        articles = load_json_articles(args.articles)
+        start = time.perf_counter()
+        scores = model.score_articles(articles)
+        elapsed = time.perf_counter() - start
+        ranked = sorted(zip(scores, articles), key=lambda x: x[0], reverse=True)
+        for score, article in ranked[:args.top]:
+            print(f"[{score:3d}] {article.get('title', 'No title')[:80]}")
+            print(f"      {article.get('url', '')}")
+        print(f"\nScored {len(articles)} articles in {elapsed * 1000:.0f} ms "
+              f"({len(articles) / elapsed:,.0f} articles/s)")
+
+
+if __name__ == '__main__':
+    # Ensure UTF-8 encoding for stdout on Windows (only when run as a script,
+    # so importing this module never replaces the streams)
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    main()
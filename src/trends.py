@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Incremental trend detection for AI Agent Daily Digest.
+Keeps a count-min sketch of title and description terms per publication day,
+plus the top-k terms growing fastest against the trailing window. Each
+collection run only adds its new articles, and each batch term's estimate is
+compared with the earlier days' sketches, so rare but fast-rising terms are kept
+as candidates even when common words outnumber them. Day states older than the
+window are pruned, so storage stays bounded.
+
+Layout:
+    trends/
+    └── YYYY-MM-DD.json   # Per-day sketch, rising terms and seen articles
+"""
+
+import argparse
+import base64
+import hashlib
+import html
+import json
+import re
+import sys
+import zlib
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+from article_archive import partition_key, UNDATED_PARTITION
+
+# Wide enough for the ~60k distinct terms of a busy day without saturating
+SKETCH_WIDTH = 65536
+SKETCH_DEPTH = 4
+RISING_TERMS = 300
+TRAILING_DAYS = 14
+# A term must grow by more than this fraction over its expected count to be emerging
+SPIKE_MARGIN = 0.5
+MAX_FUTURE_DAYS = 1  # Tolerate feeds whose timezone puts them a day ahead
+
+TAG_RE = re.compile(r'<[^>]+>')
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#\-]*[a-z0-9+#]|[a-z0-9]")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before
+being below between both but by can could did do does doing down during each few for from
+further had has have having he her here hers him his how i if in into is it its itself just
+me more most my new no nor not now of off on once only or other our ours out over own same
+she should so some such than that the their theirs them then there these they this those
+through to too under until up very was we were what when where which while who whom why
+will with would you your yours via using use used based paper propose proposed show shows
+approach method methods results work however within without across one two first
+may many much well even still like get gets make makes made way ways post appeared abstract
+arxiv abs announce type cross replace com www https http html amp nbsp
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with markup, entities and stopwords removed."""
+    text = html.unescape(TAG_RE.sub(' ', text)).lower()
+    return [t for t in TOKEN_RE.findall(text)
+            if len(t) > 1 and t not in STOPWORDS and not t.isdigit()]
+
+
+def extract_terms(article: Dict[str, Any]) -> set:
+    """Distinct unigrams and bigrams from an article's title and description."""
+    terms = set()
+    texts = (article.get('title', ''), article.get('description_text', article.get('description', '')))
+    for text in texts:
+        tokens = tokenize(str(text))
+        terms.update(tokens)
+        terms.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return terms
+
+
+class CountMinSketch:
+    """Fixed-size frequency sketch; estimates never undercount."""
+
+    def __init__(self, width: int = SKETCH_WIDTH, depth: int = SKETCH_DEPTH,
+                 table: Optional[array] = None):
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else array('I', bytes(4 * width * depth))
+
+    def cells(self, term: str) -> List[int]:
+        """Table cells for a term; reusable across sketches of the same shape."""
+        digest = hashlib.blake2b(term.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [row * self.width + (h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def add(self, term: str, count: int = 1) -> None:
+        # Conservative update: only raise cells to the new minimum estimate
+        cells = self.cells(term)
+        target = self.estimate_cells(cells) + count
+        for cell in cells:
+            if self.table[cell] < target:
+                self.table[cell] = target
+
+    def estimate(self, term: str) -> int:
+        return self.estimate_cells(self.cells(term))
+
+    def estimate_cells(self, cells: List[int]) -> int:
+        table = self.table
+        return min(table[cell] for cell in cells)
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Most cells of a wide sketch are zero, so the table compresses well
+        return {
+            'width': self.width,
+            'depth': self.depth,
+            'encoding': 'zlib',
+            'table': base64.b64encode(zlib.compress(self.table.tobytes())).decode('ascii')
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CountMinSketch':
+        raw = base64.b64decode(data['table'])
+        if data.get('encoding') == 'zlib':
+            raw = zlib.decompress(raw)
+        table = array('I')
+        table.frombytes(raw)
+        return cls(data['width'], data['depth'], table)
+
+
+def growth(count: int, articles: int, baseline_share: float) -> Tuple[float, float]:
+    """(ratio, expected count) of a term against its trailing-window share."""
+    expected = baseline_share * articles
+    # Add-one smoothing keeps brand-new terms finite and favors larger counts
+    return (count + 1) / (expected + 1), expected
+
+
+class Baseline:
+    """Term shares over the trailing window, from earlier days' sketches."""
+
+    def __init__(self, history: List['DayState']):
+        self.history = history
+        self.articles = sum(h.articles for h in history)
+
+    def share(self, term: str, sketch: CountMinSketch, cells: List[int]) -> float:
+        """Trailing share of `term`, whose `cells` were computed for `sketch`'s shape."""
+        if not self.articles:
+            return 0.0
+        shape = (sketch.width, sketch.depth)
+        total = 0
+        for h in self.history:
+            # Days stored with another sketch size need their own cells
+            same_shape = (h.sketch.width, h.sketch.depth) == shape
+            total += h.sketch.estimate_cells(cells) if same_shape else h.sketch.estimate(term)
+        return total / self.articles
+
+
+class RisingTerms:
+    """Top-k terms ranked by growth over the trailing window, bounded to `capacity` entries."""
+
+    def __init__(self, capacity: int = RISING_TERMS, counters: Optional[Dict[str, int]] = None):
+        self.capacity = capacity
+        self.counters: Dict[str, int] = counters or {}
+
+    def update(self, terms: Iterable[str], sketch: CountMinSketch, baseline: Baseline,
+               articles: int) -> None:
+        """Re-rank current entries together with newly counted terms."""
+        candidates = set(self.counters)
+        candidates.update(terms)
+        ranked = []
+        for term in candidates:
+            cells = sketch.cells(term)
+            count = sketch.estimate_cells(cells)
+            ratio, _ = growth(count, articles, baseline.share(term, sketch, cells))
+            ranked.append((ratio, count, term))
+        ranked.sort(reverse=True)
+        self.counters = {term: count for _, count, term in ranked[:self.capacity]}
+
+
+class DayState:
+    """Trend summaries for a single publication day."""
+
+    def __init__(self, day: str):
+        self.day = day
+        self.articles = 0
+        self.seen: set = set()
+        self.sketch = CountMinSketch()
+        self.rising = RisingTerms()
+
+    def add_articles(self, articles: List[Dict[str, Any]], baseline: Optional[Baseline] = None) -> int:
+        """
+        Add articles not yet counted for this day, ranking their terms by growth
+        against `baseline`. Returns how many were new.
+        """
+        batch: Dict[str, int] = {}
+        added = 0
+        for article in articles:
+            key = article.get('url') or f"{article.get('source_url', '')}#{article.get('title', '')}"
+            article_id = hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+            if article_id in self.seen:
+                continue
+            self.seen.add(article_id)
+            added += 1
+            for term in extract_terms(article):
+                batch[term] = batch.get(term, 0) + 1
+
+        for term, count in batch.items():
+            self.sketch.add(term, count)
+        self.articles += added
+        self.rising.update(batch, self.sketch, baseline or Baseline([]), self.articles)
+        return added
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'day': self.day,
+            'articles': self.articles,
+            'seen': sorted(self.seen),
+            'sketch': self.sketch.to_dict(),
+            'rising': self.rising.counters
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DayState':
+        state = cls(data['day'])
+        state.articles = data['articles']
+        state.seen = set(data['seen'])
+        state.sketch = CountMinSketch.from_dict(data['sketch'])
+        # Older files ranked candidates by raw count
+        state.rising = RisingTerms(counters=data.get('rising', data.get('heavy_hitters')))
+        return state
+
+
+def load_day(trends_dir: Path, day: str) -> Optional[DayState]:
+    path = trends_dir / f"{day}.json"
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return DayState.from_dict(json.load(f))
+
+
+def save_day(trends_dir: Path, state: DayState) -> None:
+    trends_dir.mkdir(parents=True, exist_ok=True)
+    with open(trends_dir / f"{state.day}.json", 'w', encoding='utf-8') as f:
+        json.dump(state.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+
+
+def stored_days(trends_dir: Path) -> List[str]:
+    if not trends_dir.is_dir():
+        return []
+    return sorted(p.stem for p in trends_dir.glob('????-??-??.json'))
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _latest_day(days: List[str], today: date) -> Optional[str]:
+    """Most recent stored day that is not past the future-day tolerance."""
+    limit = (today + timedelta(days=MAX_FUTURE_DAYS)).isoformat()
+    valid = [d for d in days if d <= limit]
+    return valid[-1] if valid else None
+
+
+def load_history(trends_dir: Path, day: str, window: int = TRAILING_DAYS,
+                 days: Optional[List[str]] = None) -> List[DayState]:
+    """Stored states for the `window` days before `day`."""
+    start = (date.fromisoformat(day) - timedelta(days=window)).isoformat()
+    days = stored_days(trends_dir) if days is None else days
+    return [load_day(trends_dir, d) for d in days if start <= d < day]
+
+
+def update_trends(trends_dir: Path, articles: Iterable[Dict[str, Any]],
+                  window: int = TRAILING_DAYS) -> int:
+    """
+    Fold newly collected articles into the per-day summaries.
+    Only days touched by the new articles are loaded and rewritten.
+    Articles dated after tomorrow are ignored, and the window is measured from
+    today, so a misdated article cannot push the rest of the history out.
+    Returns the number of articles that had not been counted before.
+    """
+    today = _today()
+    newest = (today + timedelta(days=MAX_FUTURE_DAYS)).isoformat()
+    oldest = (today - timedelta(days=window)).isoformat()
+
+    by_day: Dict[str, List[Dict[str, Any]]] = {}
+    for article in articles:
+        day = partition_key(article)
+        if day != UNDATED_PARTITION and oldest <= day <= newest:
+            by_day.setdefault(day, []).append(article)
+
+    added = 0
+    days = stored_days(trends_dir)
+    for day, day_articles in by_day.items():
+        state = load_day(trends_dir, day) or DayState(day)
+        new = state.add_articles(day_articles, Baseline(load_history(trends_dir, day, window, days)))
+        if new:
+            save_day(trends_dir, state)
+            added += new
+
+    # Prune days that have fallen out of the trailing window (or were stored misdated)
+    for day in stored_days(trends_dir):
+        if day < oldest or day > newest:
+            (trends_dir / f"{day}.json").unlink()
+
+    return added
+
+
+def find_spikes(trends_dir: Path, day: Optional[str] = None, window: int = TRAILING_DAYS,
+                min_count: int = 3, top: int = 20, margin: float = SPIKE_MARGIN) -> List[Dict[str, Any]]:
+    """
+    Rank the day's rising terms by how far their article share exceeds the
+    trailing window's average share. Only terms whose ratio exceeds 1 + margin
+    count, and nothing is emerging without at least one earlier day to compare.
+    Defaults to the latest day not in the future.
+    """
+    days = stored_days(trends_dir)
+    day = day or _latest_day(days, _today())
+    if day is None:
+        return []
+    current = load_day(trends_dir, day)
+    if current is None or current.articles == 0:
+        return []
+
+    baseline = Baseline(load_history(trends_dir, day, window, days))
+    if not baseline.articles:
+        return []
+
+    spikes = []
+    for term in current.rising.counters:
+        cells = current.sketch.cells(term)
+        count = current.sketch.estimate_cells(cells)
+        if count < min_count:
+            continue
+        ratio, expected = growth(count, current.articles, baseline.share(term, current.sketch, cells))
+        if ratio <= 1 + margin:
+            continue
+        spikes.append({
+            'term': term,
+            'count': count,
+            'expected': round(expected, 1),
+            'ratio': round(ratio, 2),
+            'share': round(count / current.articles, 4)
+        })
+
+    spikes.sort(key=lambda x: (x['ratio'], x['count']), reverse=True)
+    return spikes[:top]
+
+
+def print_spikes(spikes: List[Dict[str, Any]], day: str, history_days: int) -> None:
+    print(f"Emerging terms for {day} (vs trailing {history_days} days):")
+    if not history_days:
+        print("  (no earlier days stored yet; nothing to compare against)")
+    elif not spikes:
+        print("  (no terms above threshold)")
+    for spike in spikes:
+        print(f"  {spike['ratio']:6.2f}x  {spike['count']:4d} articles "
+              f"(expected {spike['expected']:.1f})  {spike['term']}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description='Track emerging terms across collected articles for AI agent digest'
+    )
+    parser.add_argument(
+        '--trends',
+        type=Path,
+        default=Path('ai-digest/data/trends'),
+        help='Directory holding per-day trend summaries'
+    )
+    parser.add_argument(
+        '--window',
+        type=int,
+        default=TRAILING_DAYS,
+        help=f'Trailing window in days (default: {TRAILING_DAYS})'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    update_parser = subparsers.add_parser('update', help='Add collected articles to the trend summaries')
+    update_parser.add_argument(
+        '--input',
+        type=Path,
+        default=Path('ai-digest/data/collected_articles.json'),
+        help='Collected articles JSON to add'
+    )
+    update_parser.add_argument('--archive', type=Path, help='Backfill from an archive directory instead')
+
+    report_parser = subparsers.add_parser('report', help='Show spiking terms for a day')
+    report_parser.add_argument('--day', help='Day to report (YYYY-MM-DD, default: latest up to today)')
+    report_parser.add_argument('--top', type=int, default=20, help='Number of terms to show (default: 20)')
+    report_parser.add_argument('--min-count', type=int, default=3, help='Minimum articles per term (default: 3)')
+    report_parser.add_argument(
+        '--margin',
+        type=float,
+        default=SPIKE_MARGIN,
+        help=f'Required growth over the expected count, as a fraction (default: {SPIKE_MARGIN})'
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'update':
+        if args.archive:
+            from article_archive import read_range
+            start = _today() - timedelta(days=args.window)
+            articles = read_range(args.archive, start=start)
+        else:
+            from article_archive import load_json_articles
+            articles = load_json_articles(args.input)
+        added = update_trends(args.trends, articles, args.window)
+        print(f"✓ Added {added} new articles to trend summaries in {args.trends}")
+    elif args.command == 'report':
+        days = stored_days(args.trends)
+        day = args.day or _latest_day(days, _today()) or _today().isoformat()
+        spikes = find_spikes(args.trends, day, args.window, args.min_count, args.top, args.margin)
+        start = (date.fromisoformat(day) - timedelta(days=args.window)).isoformat()
+        print_spikes(spikes, day, sum(1 for d in days if start <= d < day))
+
+
+if __name__ == '__main__':
+    # Ensure UTF-8 encoding for stdout on Windows (only when run as a script,
+    # so importing this module never replaces the streams)
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,134 @@
+import json
+from datetime import date
+
+import pytest
+
+import article_archive
+from article_archive import (
+    UNDATED_PARTITION, append_articles, compact_archive, export_range,
+    load_index, read_range, select_chunks,
+)
+
+
+def make_article(n, day='2025-11-20', **fields):
+    article = {
+        'title': f'Article {n}',
+        'url': f'https://example.com/{n}',
+        'source': 'Example',
+        'source_url': 'https://example.com/feed',
+        'published': f'{day}T12:00:00+00:00' if day else 'Unknown',
+        'description': f'Description {n}',
+        'date_verified': day is not None,
+    }
+    article.update(fields)
+    return article
+
+
+@pytest.fixture(params=['gzip', 'zstd'])
+def codec(request):
+    if request.param == 'zstd' and article_archive.zstandard is None:
+        pytest.skip('zstandard not installed')
+    return request.param
+
+
+def test_append_writes_one_chunk_per_day(tmp_path, codec):
+    articles = [make_article(1, '2025-11-19'), make_article(2, '2025-11-20'),
+                make_article(3, '2025-11-20'), make_article(4, None)]
+    chunks = append_articles(tmp_path, articles, codec=codec)
+
+    assert sorted(c['day'] for c in chunks) == ['2025-11-19', '2025-11-20', UNDATED_PARTITION]
+    index = load_index(tmp_path)
+    assert index['next_seq'] == 4
+    assert all((tmp_path / c['file']).exists() for c in index['chunks'])
+    assert {c['day']: c['count'] for c in index['chunks']}['2025-11-20'] == 2
+
+
+def test_read_range_round_trip_and_selection(tmp_path, codec):
+    articles = [make_article(1, '2025-11-18'), make_article(2, '2025-11-19'),
+                make_article(3, '2025-11-20'), make_article(4, None)]
+    append_articles(tmp_path, articles, codec=codec)
+
+    everything = read_range(tmp_path, include_undated=True)
+    assert {a['url'] for a in everything} == {a['url'] for a in articles}
+    assert everything[0]['title'] == 'Article 3'  # most recent first
+
+    window = read_range(tmp_path, date(2025, 11, 19), date(2025, 11, 20))
+    assert [a['title'] for a in window] == ['Article 3', 'Article 2']
+
+    index = load_index(tmp_path)
+    assert [c['day'] for c in select_chunks(index, date(2025, 11, 20))] == ['2025-11-20']
+    assert UNDATED_PARTITION in [c['day'] for c in select_chunks(index, include_undated=True)]
+
+
+def test_later_runs_win_and_compaction_preserves_reads(tmp_path, codec):
+    append_articles(tmp_path, [make_article(1), make_article(2)], codec=codec)
+    append_articles(tmp_path, [make_article(2, description='Updated'), make_article(3)], codec=codec)
+    append_articles(tmp_path, [make_article(4, '2025-11-21')], codec=codec)
+    before = read_range(tmp_path)
+
+    old_files = [c['file'] for c in load_index(tmp_path)['chunks'] if c['day'] == '2025-11-20']
+    assert compact_archive(tmp_path, codec=codec) == 2
+
+    index = load_index(tmp_path)
+    days = [c['day'] for c in index['chunks']]
+    assert sorted(days) == ['2025-11-20', '2025-11-21']
+    assert not any((tmp_path / f).exists() for f in old_files)
+
+    after = read_range(tmp_path)
+    assert sorted(before, key=lambda a: a['url']) == sorted(after, key=lambda a: a['url'])
+    updated = next(a for a in after if a['url'].endswith('/2'))
+    assert updated['description'] == 'Updated'
+    merged = next(c for c in index['chunks'] if c['day'] == '2025-11-20')
+    assert merged['count'] == 3
+
+    # Nothing left to merge
+    assert compact_archive(tmp_path, codec=codec) == 0
+
+
+def test_compact_only_requested_days(tmp_path):
+    for _ in range(2):
+        append_articles(tmp_path, [make_article(1, '2025-11-19'), make_article(2, '2025-11-20')])
+    assert compact_archive(tmp_path, days=['2025-11-20']) == 2
+    days = sorted(c['day'] for c in load_index(tmp_path)['chunks'])
+    assert days == ['2025-11-19', '2025-11-19', '2025-11-20']
+
+
+def test_export_range_matches_collected_format(tmp_path):
+    archive = tmp_path / 'archive'
+    append_articles(archive, [make_article(1, '2025-11-19'), make_article(2, '2025-11-20'),
+                              make_article(3, None)])
+    output = tmp_path / 'export.json'
+
+    # Undated articles are exported unless excluded
+    assert export_range(archive, output, date(2025, 11, 20), date(2025, 11, 20)) == 2
+    assert export_range(archive, output, date(2025, 11, 20), date(2025, 11, 20),
+                        include_undated=False) == 1
+    with open(output, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['total_articles'] == 1
+    assert data['articles'][0]['title'] == 'Article 2'
+    assert data['cutoff_time'].startswith('2025-11-20T00:00:00')
+    assert data['hours'] == 24
+
+    assert export_range(archive, output) == 3
+
+
+def test_unsupported_index_version(tmp_path):
+    (tmp_path / 'index.json').write_text(json.dumps({'version': 99, 'chunks': []}))
+    with pytest.raises(ValueError):
+        load_index(tmp_path)
+
+
+def test_cache_drops_compacted_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(article_archive, '_cache', {})
+    for _ in range(3):
+        append_articles(tmp_path, [make_article(1), make_article(2)])
+    first = read_range(tmp_path)
+    assert len(article_archive._cache) == 3
+
+    compact_archive(tmp_path)
+    # Cached articles are copies, so callers cannot corrupt later reads
+    first[0]['title'] = 'changed'
+    assert all(a['title'] != 'changed' for a in read_range(tmp_path))
+    assert list(article_archive._cache) == [str((tmp_path / c['file']).resolve())
+                                            for c in load_index(tmp_path)['chunks']]
@@ -0,0 +1,117 @@
+import struct
+
+import pytest
+
+from columnar_snapshot import (
+    MAGIC, UNKNOWN_TIMESTAMP, ColumnarSnapshot, append_snapshot,
+    count_per_source_per_day, open_snapshot, write_snapshot,
+)
+
+
+def make_article(n, source='Example', day='2025-11-20', **fields):
+    article = {
+        'title': f'Agent framework {n} ✓',
+        'url': f'https://example.com/{n}',
+        'source': source,
+        'published': f'{day}T12:00:00+00:00' if day else 'Unknown',
+        'description': '<p>raw markup</p>',
+        'description_text': f'Production agent deployment {n}',
+        'date_verified': n % 2 == 0,
+    }
+    article.update(fields)
+    return article
+
+
+def read_all(snapshot_dir):
+    segments = open_snapshot(snapshot_dir)
+    try:
+        return [
+            (segment.string('url', row), segment.string('title', row),
+             segment.string('description', row), segment.sources[segment.column('source_id')[row]],
+             segment.column('published')[row], segment.column('date_verified')[row])
+            for segment in segments for row in range(segment.rows)
+        ]
+    finally:
+        for segment in segments:
+            segment.close()
+
+
+def test_write_round_trip(tmp_path):
+    snapshot_dir = tmp_path / 'articles.snapshot'
+    articles = [make_article(1), make_article(2, source='Other'), make_article(3, day=None)]
+    write_snapshot(articles, snapshot_dir)
+
+    rows = read_all(snapshot_dir)
+    assert [r[0] for r in rows] == [a['url'] for a in articles]
+    assert rows[0][1] == 'Agent framework 1 ✓'
+    assert rows[0][2] == 'Production agent deployment 1'  # normalized text preferred
+    assert [r[3] for r in rows] == ['Example', 'Other', 'Example']
+    assert rows[2][4] == UNKNOWN_TIMESTAMP
+    assert [r[5] for r in rows] == [0, 1, 0]
+
+
+def test_segment_layout_is_aligned(tmp_path):
+    snapshot_dir = tmp_path / 'articles.snapshot'
+    write_snapshot([make_article(n) for n in range(5)], snapshot_dir)
+    (path,) = snapshot_dir.glob('*.col')
+    data = path.read_bytes()
+
+    assert data[:8] == MAGIC
+    header_len = struct.unpack_from('<Q', data, 8)[0]
+    with ColumnarSnapshot(path) as segment:
+        columns = segment.header['columns']
+    # Absolute offsets point past the header and every column is 8-byte aligned
+    assert min(c['offset'] for c in columns.values()) >= 16 + header_len
+    assert all(c['offset'] % 8 == 0 for c in columns.values())
+    assert max(c['offset'] + c['length'] for c in columns.values()) == len(data)
+
+
+def test_append_adds_only_new_rows(tmp_path):
+    snapshot_dir = tmp_path / 'articles.snapshot'
+    assert append_snapshot([make_article(1)], snapshot_dir) is None
+
+    write_snapshot([make_article(1), make_article(2), make_article(1)], snapshot_dir)
+    assert len(read_all(snapshot_dir)) == 2
+
+    assert append_snapshot([make_article(2), make_article(3), make_article(3)], snapshot_dir) == 1
+    assert append_snapshot([make_article(1), make_article(3)], snapshot_dir) == 0
+    assert sorted(p.name for p in snapshot_dir.glob('*.col')) == ['000001.col', '000002.col']
+    assert sorted(r[0] for r in read_all(snapshot_dir)) == [
+        'https://example.com/1', 'https://example.com/2', 'https://example.com/3']
+
+
+def test_rebuild_replaces_segments(tmp_path):
+    snapshot_dir = tmp_path / 'articles.snapshot'
+    write_snapshot([make_article(1)], snapshot_dir)
+    append_snapshot([make_article(2)], snapshot_dir)
+    write_snapshot([make_article(3)], snapshot_dir)
+
+    assert [p.name for p in snapshot_dir.glob('*.col')] == ['000003.col']
+    assert [r[0] for r in read_all(snapshot_dir)] == ['https://example.com/3']
+
+
+def test_counts_merge_sources_across_segments(tmp_path):
+    snapshot_dir = tmp_path / 'articles.snapshot'
+    write_snapshot([make_article(1, source='A'), make_article(2, source='B')], snapshot_dir)
+    append_snapshot([make_article(3, source='B'), make_article(4, source='A', day=None)], snapshot_dir)
+
+    segments = open_snapshot(snapshot_dir)
+    try:
+        counts = count_per_source_per_day(segments)
+    finally:
+        for segment in segments:
+            segment.close()
+    day = 20412  # 2025-11-20 in days since the epoch
+    assert counts == {(day, 'A'): 1, (day, 'B'): 2}
+
+
+def test_open_missing_snapshot(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        open_snapshot(tmp_path / 'missing')
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'bogus.col'
+    path.write_bytes(b'not a snapshot' * 4)
+    with pytest.raises(ValueError):
+        ColumnarSnapshot(path)
@@ -0,0 +1,100 @@
+import json
+from datetime import date, timedelta
+
+import normalize
+from normalize import learn_templates, main, normalize_articles, search_text
+
+
+TOPICS = ['planning', 'memory', 'tool use', 'evaluation', 'retrieval', 'routing', 'sandboxing',
+          'tracing', 'guardrails', 'caching', 'scheduling', 'handoffs']
+FOOTER = '<p>The post <a href="https://blog.example.com/{n}">Post {n}</a> appeared first on ' \
+         '<a href="https://blog.example.com">Example Blog</a>.</p>'
+
+
+def make_articles(count, source='Example Blog', prefix='post'):
+    return [{
+        'title': f'Agent Release {n}',
+        'url': f'https://blog.example.com/{prefix}/{n}',
+        'source': source,
+        'description': f'<p>What changed in {TOPICS[n % len(TOPICS)]} for release {n}.</p>'
+                       + FOOTER.format(n=n),
+    } for n in range(count)]
+
+
+def test_footer_is_removed_and_search_text_is_not_stored(tmp_path):
+    articles = make_articles(10)
+    normalize_articles(articles, tmp_path / 'templates.json', tmp_path / 'cache.json')
+
+    assert articles[3]['description_text'] == 'What changed in evaluation for release 3.'
+    assert 'search_text' not in articles[3]
+    assert search_text(articles[3]) == 'agent release 3 what changed in evaluation for release 3.'
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    collection = tmp_path / 'collected.json'
+    collection.write_text(json.dumps({'articles': make_articles(10)}), encoding='utf-8')
+    before = collection.read_text(encoding='utf-8')
+
+    main(['--dry-run', '--templates', str(tmp_path / 'templates.json'),
+          '--cache', str(tmp_path / 'cache.json'), str(collection)])
+
+    assert collection.read_text(encoding='utf-8') == before
+    assert not (tmp_path / 'templates.json').exists()
+    assert not (tmp_path / 'cache.json').exists()
+
+
+def test_story_syndicated_to_several_feeds_is_not_a_shared_template(tmp_path):
+    story = '<p>Acme launches an agent platform today.</p><p>Read the full story on the Acme blog.</p>'
+    articles = []
+    for source in ('Feed A', 'Feed B', 'Feed C', 'Feed D'):
+        articles += make_articles(10, source=source, prefix=source)
+        articles.append({'title': 'Acme launch', 'source': source, 'description': story})
+
+    templates = normalize_articles(articles, tmp_path / 'templates.json', tmp_path / 'cache.json')
+
+    shared = templates['*']
+    assert 'the post {link} appeared first on {link}.' in shared['tail']
+    assert 'read the full story on the acme blog.' not in shared['tail']
+    assert articles[-1]['description_text'] == 'Acme launches an agent platform today.\nRead the full story on the Acme blog.'
+
+
+def arxiv_articles(count, announce_type):
+    return [{
+        'title': f'Paper {n}',
+        'source': 'arXiv cs.AI',
+        'description': f'arXiv:2510.{n:05d}v1 Announce Type: {announce_type}\n'
+                       f'Abstract: We study {TOPICS[n % len(TOPICS)]} in agents, part {n}.',
+    } for n in range(count)]
+
+
+def test_rare_template_survives_and_absent_template_expires_over_runs():
+    today = date.today()
+    templates = learn_templates(arxiv_articles(20, 'replace'), today=today - timedelta(days=10))
+    assert 'arxiv:#.#v# announce type: replace' in templates['arXiv cs.AI']['head']
+
+    # Seen in 2 of 62 articles: below MIN_SHARE, but still refreshed rather than dropped
+    rare = arxiv_articles(60, 'new') + arxiv_articles(2, 'replace')
+    templates = learn_templates(rare, templates, today=today - timedelta(days=9))
+    assert templates['arXiv cs.AI']['head']['arxiv:#.#v# announce type: replace'] == \
+        (today - timedelta(days=9)).isoformat()
+
+    # One run without it is not enough to drop it
+    templates = learn_templates(arxiv_articles(60, 'new'), templates, today=today - timedelta(days=5))
+    assert 'arxiv:#.#v# announce type: replace' in templates['arXiv cs.AI']['head']
+
+    # A week of the feed publishing without it is
+    templates = learn_templates(arxiv_articles(60, 'new'), templates, today=today)
+    assert 'arxiv:#.#v# announce type: replace' not in templates['arXiv cs.AI']['head']
+    assert 'arxiv:#.#v# announce type: new' in templates['arXiv cs.AI']['head']
+
+
+def test_warm_run_reuses_cached_descriptions_without_parsing(tmp_path, monkeypatch):
+    normalize_articles(make_articles(10), tmp_path / 'templates.json', tmp_path / 'cache.json')
+
+    def fail(raw):
+        raise AssertionError(f'parsed a cached description: {raw[:40]}')
+    monkeypatch.setattr(normalize, '_marked_lines', fail)
+
+    articles = make_articles(10)
+    normalize_articles(articles, tmp_path / 'templates.json', tmp_path / 'cache.json')
+    assert articles[3]['description_text'] == 'What changed in evaluation for release 3.'
@@ -0,0 +1,56 @@
+from datetime import date, timedelta
+
+import trends
+from trends import find_spikes, stored_days, update_trends
+
+
+BACKGROUND = ['agent framework release', 'model performance benchmark', 'large language models',
+              'agent memory evaluation', 'model serving framework']
+
+
+def make_articles(day, count, prefix, extra_title=None, extra_count=0):
+    articles = []
+    for n in range(count):
+        title = BACKGROUND[n % len(BACKGROUND)]
+        if n < extra_count:
+            title = f"{title} {extra_title}"
+        articles.append({
+            'title': title,
+            'url': f'https://example.com/{prefix}/{n}',
+            'description': 'Notes on building production agents with models.',
+            'published': f'{day.isoformat()}T10:00:00+00:00',
+        })
+    return articles
+
+
+def test_no_emerging_terms_without_history(tmp_path):
+    today = date.today()
+    update_trends(tmp_path, make_articles(today, 50, 'today', 'zorblax', 10))
+    assert find_spikes(tmp_path) == []
+
+
+def test_rare_new_term_is_emerging_and_background_is_not(tmp_path):
+    today = date.today()
+    for offset in range(1, 4):
+        day = today - timedelta(days=offset)
+        update_trends(tmp_path, make_articles(day, 400, day.isoformat()))
+    update_trends(tmp_path, make_articles(today, 400, 'today', 'zorblax', 12))
+
+    spikes = find_spikes(tmp_path, top=10)
+    # The new word and its new bigrams; none of the background terms
+    assert spikes and all('zorblax' in s['term'] for s in spikes)
+    assert spikes[0]['term'] == 'zorblax' and spikes[0]['count'] == 12
+    assert spikes[0]['ratio'] > 1 + trends.SPIKE_MARGIN
+
+
+def test_future_dated_articles_do_not_prune_history(tmp_path):
+    today = date.today()
+    update_trends(tmp_path, make_articles(today - timedelta(days=2), 5, 'old'))
+    update_trends(tmp_path, make_articles(date(2099, 1, 1), 5, 'future'))
+    assert stored_days(tmp_path) == [(today - timedelta(days=2)).isoformat()]
+
+
+def test_recounting_the_same_articles_is_a_no_op(tmp_path):
+    articles = make_articles(date.today(), 20, 'today')
+    assert update_trends(tmp_path, articles) == 20
+    assert update_trends(tmp_path, articles) == 0